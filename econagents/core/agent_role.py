@@ -1,10 +1,14 @@
 import json
 import logging
+import os
 import re
 from abc import ABC
+from collections import OrderedDict
 from pathlib import Path
-from typing import Any, Callable, ClassVar, Dict, Generic, Literal, Optional, Pattern, Protocol, TypeVar
+from typing import Any, Callable, ClassVar, Collection, Dict, Generic, Literal, Optional, Pattern, Protocol, TypeVar
+from weakref import WeakKeyDictionary
 
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template, meta
 from jinja2.sandbox import SandboxedEnvironment
 
 from econagents.core.logging_mixin import LoggerMixin
@@ -18,7 +22,7 @@ class AgentProtocol(Protocol):
     role: ClassVar[int]
     name: ClassVar[str]
     llm: ChatOpenAI
-    task_phases: ClassVar[list[int]]
+    task_phases: ClassVar[Collection[int]]
 
 
 SystemPromptHandler = Callable[[StateT_contra], str]
@@ -43,15 +47,60 @@ class AgentRole(ABC, Generic[StateT_contra], LoggerMixin):
     """Human-readable name for this role"""
     llm: ChatOpenAI
     """Language model instance for generating responses"""
-    task_phases: ClassVar[list[int]] = []  # Empty list means no specific phases are required
-    """List of phases this agent should participate in (empty means all phases)"""
-    task_phases_excluded: ClassVar[list[int]] = []  # Empty list means no phases are excluded
+    task_phases: ClassVar[Collection[int]] = frozenset()  # Empty means no specific phases are required
+    """Phases this agent should participate in (empty means all phases), stored as a frozenset"""
+    task_phases_excluded: ClassVar[Collection[int]] = frozenset()  # Empty means no phases are excluded
+    llm_response_cache_size: ClassVar[int] = 0
+    """Number of LLM responses to reuse for identical prompts (0 disables the cache)"""
 
     # Regex patterns for method name extraction
     _SYSTEM_PROMPT_PATTERN: ClassVar[Pattern] = re.compile(r"get_phase_(\d+)_system_prompt")
     _USER_PROMPT_PATTERN: ClassVar[Pattern] = re.compile(r"get_phase_(\d+)_user_prompt")
     _RESPONSE_PARSER_PATTERN: ClassVar[Pattern] = re.compile(r"parse_phase_(\d+)_llm_response")
     _PHASE_HANDLER_PATTERN: ClassVar[Pattern] = re.compile(r"handle_phase_(\d+)$")
+    # All of the above in one pattern, with a named group per kind of phase-specific method
+    _PHASE_METHOD_PATTERN: ClassVar[Pattern] = re.compile(
+        r"(?:get_phase_(?P<system_prompt>\d+)_system_prompt"
+        r"|get_phase_(?P<user_prompt>\d+)_user_prompt"
+        r"|parse_phase_(?P<response_parser>\d+)_llm_response"
+        r"|handle_phase_(?P<phase_handler>\d+))$"
+    )
+    # Characters a JSON document can start with, to reject other LLM responses without trying to parse them
+    _JSON_START_CHARS: ClassVar[frozenset[str]] = frozenset('{["-0123456789tfn')
+    # Opening code fence, with a language tag if one is followed by whitespace or a JSON object/array
+    _CODE_FENCE_OPENING_PATTERN: ClassVar[Pattern] = re.compile(r"```(?:[A-Za-z][\w+-]*(?=[\s{\[]))?\s*")
+    # Kind, phase and name of each phase-specific method the role defines or inherits, found once per class
+    _phase_methods: ClassVar[tuple[tuple[str, int, str], ...]] = ()
+
+    # Template environments shared by all roles, keyed by prompt directory, whether they are sandboxed and
+    # their bytecode cache directory.
+    # Prompt templates are written by the experimenter, not supplied by players or the server,
+    # so by default they are rendered without Jinja's sandbox. Templates are not reloaded when their files change;
+    # call clear_template_cache() after editing prompts in a running process.
+    _template_environments: ClassVar[Dict[tuple[Path, bool, Optional[Path]], Environment]] = {}
+    sandbox_templates: ClassVar[bool] = False
+    """Render prompt templates in Jinja's sandbox, for templates that come from untrusted sources"""
+    template_bytecode_cache_dir: ClassVar[Optional[Path]] = None
+    """Directory where compiled prompt templates are cached between runs (None keeps them in memory only)"""
+    # Names of the files in each prompt directory, listed once instead of probing for every candidate prompt file
+    _prompt_file_names: ClassVar[Dict[Path, frozenset[str]]] = {}
+    # Rendered text of templates that use no context (None for templates that do), keyed by compiled template
+    _static_prompts: ClassVar["WeakKeyDictionary[Template, Optional[str]]"] = WeakKeyDictionary()
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        """Find the phase-specific methods of a new role class, including those it inherits from any base class.
+
+        The task phase lists are also turned into frozensets, so checking a phase against them takes constant time.
+        """
+        super().__init_subclass__(**kwargs)
+        cls.task_phases = frozenset(cls.task_phases)
+        cls.task_phases_excluded = frozenset(cls.task_phases_excluded)
+        phase_methods = []
+        for attr_name in dir(cls):
+            # Only phase-specific methods for phases other than 0 are registered
+            if (match := cls._PHASE_METHOD_PATTERN.match(attr_name)) and (phase := int(match[match.lastgroup])):
+                phase_methods.append((match.lastgroup, phase, attr_name))
+        cls._phase_methods = tuple(sorted(phase_methods))
 
     def __init__(self, logger: Optional[logging.Logger] = None):
         if logger:
@@ -64,12 +113,18 @@ class AgentRole(ABC, Generic[StateT_contra], LoggerMixin):
                 f"Got task_phases={self.task_phases} and task_phases_excluded={self.task_phases_excluded}"
             )
 
+        # Roles whose prompt templates apply to this agent, in resolution order
+        self._prompt_roles = (self.name, "all")
+
         # Handler registries
         self._system_prompt_handlers: Dict[int, SystemPromptHandler] = {}
         self._user_prompt_handlers: Dict[int, UserPromptHandler] = {}
         self._response_parsers: Dict[int, ResponseParser] = {}
         self._phase_handlers: Dict[int, PhaseHandler] = {}
 
+        # Raw LLM responses keyed by (system prompt, user prompt), least recently used first
+        self._llm_response_cache: OrderedDict[tuple[str, str], str] = OrderedDict()
+
         # Auto-register phase-specific methods if they exist
         self._register_phase_specific_methods()
 
@@ -90,18 +145,118 @@ class AgentRole(ABC, Generic[StateT_contra], LoggerMixin):
         Raises:
             FileNotFoundError: If no matching prompt template is found
         """
-        # Try phase-specific prompt first
-        phase_file = prompts_path / f"{role.lower()}_{prompt_type}_phase_{phase}.jinja2"
-        if phase_file.exists():
-            return phase_file
+        file_names = self._list_prompt_files(prompts_path)
 
-        # Fall back to general prompt
-        general_file = prompts_path / f"{role.lower()}_{prompt_type}.jinja2"
-        if general_file.exists():
-            return general_file
+        # Try phase-specific prompt first, then fall back to general prompt
+        for candidate in (
+            f"{role.lower()}_{prompt_type}_phase_{phase}.jinja2",
+            f"{role.lower()}_{prompt_type}.jinja2",
+        ):
+            if candidate in file_names:
+                return prompts_path / candidate
 
         return None
 
+    @classmethod
+    def _list_prompt_files(cls, prompts_path: Path) -> frozenset[str]:
+        """Get the names of the files in a prompt directory, listing it on first use.
+
+        Args:
+            prompts_path (Path): Path to prompt templates directory
+
+        Returns:
+            frozenset[str]: File names in the directory, empty if it does not exist
+        """
+        if (file_names := AgentRole._prompt_file_names.get(prompts_path)) is None:
+            try:
+                with os.scandir(prompts_path) as entries:
+                    file_names = frozenset(entry.name for entry in entries if entry.is_file())
+            except FileNotFoundError:
+                # Not cached, so prompts are found once the directory is created
+                return frozenset()
+            AgentRole._prompt_file_names[prompts_path] = file_names
+        return file_names
+
+    @classmethod
+    def _get_template_environment(cls, templates_dir: Path) -> Environment:
+        """Get the template environment for a prompt directory, creating it on first use.
+
+        Reusing the environment lets Jinja cache compiled templates across renders.
+
+        Args:
+            templates_dir (Path): Directory containing the prompt templates
+
+        Returns:
+            Environment: Environment loading templates from the directory
+        """
+        cache_dir = cls.template_bytecode_cache_dir
+        key = (templates_dir, cls.sandbox_templates, cache_dir)
+        if (env := cls._template_environments.get(key)) is None:
+            bytecode_cache = None
+            if cache_dir is not None:
+                cache_dir.mkdir(parents=True, exist_ok=True)
+                bytecode_cache = FileSystemBytecodeCache(str(cache_dir))
+            environment_class = SandboxedEnvironment if cls.sandbox_templates else Environment
+            # Prompts are plain text sent to the LLM, so values are inserted without HTML escaping
+            env = environment_class(
+                loader=FileSystemLoader(templates_dir),
+                autoescape=False,
+                auto_reload=False,
+                bytecode_cache=bytecode_cache,
+            )
+            cls._template_environments[key] = env
+        return env
+
+    @classmethod
+    def clear_template_cache(cls) -> None:
+        """Drop all cached template environments, prompt directory listings and rendered prompts.
+
+        Templates are read again from disk on the next render, including prompt files added since their directory
+        was last listed.
+        """
+        AgentRole._template_environments.clear()
+        AgentRole._prompt_file_names.clear()
+        AgentRole._static_prompts.clear()
+
+    @classmethod
+    def _get_static_prompt(cls, env: Environment, template: Template) -> Optional[str]:
+        """Get the rendered text of a template that does not depend on its context.
+
+        Templates that reference no variables and include no other templates always render
+        to the same text, so they are rendered once and reused.
+
+        Args:
+            env (Environment): Environment the template was loaded from
+            template (Template): Compiled template
+
+        Returns:
+            Optional[str]: Rendered text if the template is context-free, None otherwise
+        """
+        try:
+            return cls._static_prompts[template]
+        except KeyError:
+            pass
+
+        source, _, _ = env.loader.get_source(env, template.name)  # type: ignore
+        ast = env.parse(source)
+        is_static = not meta.find_undeclared_variables(ast) and not any(meta.find_referenced_templates(ast))
+        rendered = template.render() if is_static else None
+        cls._static_prompts[template] = rendered
+        return rendered
+
+    def prewarm_templates(self, prompts_path: Path) -> None:
+        """Load and compile this role's prompt templates ahead of the first render.
+
+        Args:
+            prompts_path (Path): Path to prompt templates directory
+        """
+        env = self._get_template_environment(prompts_path)
+        prefixes = tuple(f"{role.lower()}_" for role in self._prompt_roles)
+        for prompt_file in prompts_path.glob("*.jinja2"):
+            if prompt_file.name.startswith(prefixes):
+                self._get_static_prompt(env, env.get_template(prompt_file.name))
+        self.logger.debug(f"Prewarmed prompt templates in {prompts_path}")
+
     def render_prompt(
         self, context: dict, prompt_type: Literal["system", "user"], phase: int, prompts_path: Path
     ) -> str:
@@ -130,11 +285,13 @@ class AgentRole(ABC, Generic[StateT_contra], LoggerMixin):
             FileNotFoundError: If no matching prompt template is found
         """
         # Try role-specific prompt first, then fall back to 'all'
-        for role in [self.name, "all"]:
+        for role in self._prompt_roles:
             if prompt_file := self._resolve_prompt_file(prompt_type, phase, role, prompts_path):
-                with prompt_file.open() as f:
-                    template = SandboxedEnvironment().from_string(f.read())
-                return template.render(**context)
+                env = self._get_template_environment(prompt_file.parent)
+                template = env.get_template(prompt_file.name)
+                if (static_prompt := self._get_static_prompt(env, template)) is not None:
+                    return static_prompt
+                return template.render(context)
 
         raise FileNotFoundError(
             f"No prompt template found for type={prompt_type}, phase={phase}, "
@@ -161,29 +318,20 @@ class AgentRole(ABC, Generic[StateT_contra], LoggerMixin):
     def _register_phase_specific_methods(self) -> None:
         """Automatically register phase-specific methods if they exist in the subclass.
 
-        This method scans the class for methods matching the naming patterns for
-        phase-specific handlers and registers them automatically.
+        The class is scanned for methods matching the naming patterns for phase-specific handlers once,
+        when it is defined; this binds and registers the methods found.
         """
-        for attr_name in dir(self):
-            # Skip special methods and non-callable attributes
-            if attr_name.startswith("__") or not callable(getattr(self, attr_name, None)):
-                continue
-
-            # Check for phase-specific system prompt handlers
-            if phase := self._extract_phase_from_pattern(attr_name, self._SYSTEM_PROMPT_PATTERN):
-                self.register_system_prompt_handler(phase, getattr(self, attr_name))
-
-            # Check for phase-specific user prompt handlers
-            elif phase := self._extract_phase_from_pattern(attr_name, self._USER_PROMPT_PATTERN):
-                self.register_user_prompt_handler(phase, getattr(self, attr_name))
-
-            # Check for phase-specific response parsers
-            elif phase := self._extract_phase_from_pattern(attr_name, self._RESPONSE_PARSER_PATTERN):
-                self.register_response_parser(phase, getattr(self, attr_name))
-
-            # Check for phase-specific handlers
-            elif phase := self._extract_phase_from_pattern(attr_name, self._PHASE_HANDLER_PATTERN):
-                self.register_phase_handler(phase, getattr(self, attr_name))
+        # Registry of each kind of phase-specific method, by its group in _PHASE_METHOD_PATTERN
+        registrations = {
+            "system_prompt": self.register_system_prompt_handler,
+            "user_prompt": self.register_user_prompt_handler,
+            "response_parser": self.register_response_parser,
+            "phase_handler": self.register_phase_handler,
+        }
+        for kind, phase, attr_name in self._phase_methods:
+            # Only callable attributes are registered
+            if callable(method := getattr(self, attr_name, None)):
+                registrations[kind](phase, method)
 
     def register_system_prompt_handler(self, phase: int, handler: SystemPromptHandler) -> None:
         """Register a custom system prompt handler for a specific phase.
@@ -225,7 +373,37 @@ class AgentRole(ABC, Generic[StateT_contra], LoggerMixin):
         self._phase_handlers[phase] = handler
         self.logger.debug(f"Registered phase handler for phase {phase}")
 
-    def get_phase_system_prompt(self, state: StateT_contra, prompts_path: Path) -> str:
+    def _get_phase_prompt(
+        self,
+        state: StateT_contra,
+        prompt_type: Literal["system", "user"],
+        handlers: Dict[int, Callable[[StateT_contra], str]],
+        prompts_path: Path,
+        context: Optional[dict[str, Any]] = None,
+    ) -> str:
+        """Get a prompt for the current phase from its registered handler or the matching template.
+
+        Args:
+            state (StateT_contra): Current game state
+            prompt_type (Literal["system", "user"]): Type of prompt (system, user)
+            handlers (Dict[int, Callable]): Phase-specific prompt handlers for this prompt type
+            prompts_path (Path): Path to prompt templates directory
+            context (Optional[dict[str, Any]]): Already dumped state to render the template with,
+                defaults to dumping the state
+
+        Returns:
+            str: Prompt string
+        """
+        phase = state.meta.phase
+        if handler := handlers.get(phase):
+            return handler(state)
+        if context is None:
+            context = state.model_dump()
+        return self.render_prompt(context=context, prompt_type=prompt_type, phase=phase, prompts_path=prompts_path)
+
+    def get_phase_system_prompt(
+        self, state: StateT_contra, prompts_path: Path, context: Optional[dict[str, Any]] = None
+    ) -> str:
         """Get the system prompt for the current phase.
 
         This method will use a phase-specific handler if registered,
@@ -234,18 +412,17 @@ class AgentRole(ABC, Generic[StateT_contra], LoggerMixin):
         Args:
             state (StateT_contra): Current game state
             prompts_path (Path): Path to prompt templates directory
+            context (Optional[dict[str, Any]]): Already dumped state to render the template with,
+                defaults to dumping the state
 
         Returns:
             str: System prompt string
         """
-        phase = state.meta.phase
-        if phase in self._system_prompt_handlers:
-            return self._system_prompt_handlers[phase](state)
-        return self.render_prompt(
-            context=state.model_dump(), prompt_type="system", phase=phase, prompts_path=prompts_path
-        )
+        return self._get_phase_prompt(state, "system", self._system_prompt_handlers, prompts_path, context)
 
-    def get_phase_user_prompt(self, state: StateT_contra, prompts_path: Path) -> str:
+    def get_phase_user_prompt(
+        self, state: StateT_contra, prompts_path: Path, context: Optional[dict[str, Any]] = None
+    ) -> str:
         """Get the user prompt for the current phase.
 
         This method will use a phase-specific handler if registered,
@@ -254,23 +431,39 @@ class AgentRole(ABC, Generic[StateT_contra], LoggerMixin):
         Args:
             state (StateT_contra): Current game state
             prompts_path (Path): Path to prompt templates directory
+            context (Optional[dict[str, Any]]): Already dumped state to render the template with,
+                defaults to dumping the state
 
         Returns:
             str: User prompt string
         """
-        phase = state.meta.phase
-        if phase in self._user_prompt_handlers:
-            return self._user_prompt_handlers[phase](state)
-        return self.render_prompt(
-            context=state.model_dump(), prompt_type="user", phase=phase, prompts_path=prompts_path
-        )
+        return self._get_phase_prompt(state, "user", self._user_prompt_handlers, prompts_path, context)
+
+    @classmethod
+    def _strip_code_fences(cls, response: str) -> str:
+        """Remove a Markdown code fence (e.g. ```json ... ```) wrapped around an LLM response.
+
+        Args:
+            response (str): Raw LLM response string
+
+        Returns:
+            str: Response without the surrounding fence, or the original response if it has none
+        """
+        text = response.strip()
+        if not text.startswith("```"):
+            return response
+        # Drop the opening fence, including any language tag; the reply may be on the same line
+        text = text[cls._CODE_FENCE_OPENING_PATTERN.match(text).end() :]
+        if text.endswith("```"):
+            text = text[:-3]
+        return text
 
     def parse_phase_llm_response(self, response: str, state: StateT_contra) -> dict:
         """Parse the LLM response for the current phase.
 
         This method will use a phase-specific parser if registered,
         otherwise it falls back to the default implementation which attempts
-        to parse the response as JSON.
+        to parse the response as JSON, ignoring a surrounding Markdown code fence.
 
         Args:
             response (str): Raw LLM response string
@@ -280,15 +473,32 @@ class AgentRole(ABC, Generic[StateT_contra], LoggerMixin):
             dict: Parsed response as a dictionary
         """
         phase = state.meta.phase
-        if phase in self._response_parsers:
-            return self._response_parsers[phase](response, state)
+        if parser := self._response_parsers.get(phase):
+            return parser(response, state)
 
-        try:
-            return json.loads(response)
-        except json.JSONDecodeError as e:
-            self.logger.error(f"Failed to parse LLM response as JSON: {e}")
-            self.logger.debug(f"Raw response: {response}")
-            return {"error": "Failed to parse response", "raw_response": response}
+        text = self._strip_code_fences(response).lstrip()
+        if text[:1] in self._JSON_START_CHARS:
+            try:
+                return json.loads(text)
+            except json.JSONDecodeError as e:
+                self.logger.error(f"Failed to parse LLM response as JSON: {e}")
+        else:
+            self.logger.error("Failed to parse LLM response as JSON: it does not start like a JSON document")
+        self.logger.debug(f"Raw response: {response}")
+        return {"error": "Failed to parse response", "raw_response": response}
+
+    def participates_in_phase(self, phase: int) -> bool:
+        """Check whether the agent acts in a phase.
+
+        Args:
+            phase (int): Game phase number
+
+        Returns:
+            bool: False if the phase is excluded, or if task_phases is non-empty and does not contain it
+        """
+        if phase in self.task_phases_excluded:
+            return False
+        return not self.task_phases or phase in self.task_phases
 
     async def handle_phase(self, phase: int, state: StateT_contra, prompts_path: Path) -> Optional[dict]:
         """Handle the current phase of the task or game.
@@ -308,23 +518,47 @@ class AgentRole(ABC, Generic[StateT_contra], LoggerMixin):
         Returns:
             Optional[dict]: Phase result dictionary or None if phase is not handled
         """
-        # Skip the phase if it's in the excluded list
-        if phase in self.task_phases_excluded:
-            self.logger.debug(f"Phase {phase} is in excluded phases {self.task_phases_excluded}, skipping")
-            return None
-
-        # Skip the phase if task_phases is non-empty and phase is not in it
-        if self.task_phases and phase not in self.task_phases:
-            self.logger.debug(f"Phase {phase} not in task phases {self.task_phases}, skipping")
+        if not self.participates_in_phase(phase):
+            self.logger.debug(
+                f"Phase {phase} not handled (task phases {self.task_phases}, "
+                f"excluded phases {self.task_phases_excluded}), skipping"
+            )
             return None
 
-        if phase in self._phase_handlers:
+        if handler := self._phase_handlers.get(phase):
             self.logger.debug(f"Using custom handler for phase {phase}")
-            return await self._phase_handlers[phase](phase, state)
+            return await handler(phase, state)
 
         self.logger.debug(f"Using default LLM handler for phase {phase}")
         return await self.handle_phase_with_llm(phase, state, prompts_path=prompts_path)
 
+    def _get_cached_llm_response(self, key: tuple[str, str]) -> Optional[str]:
+        """Get a previously received LLM response for the same prompts.
+
+        Args:
+            key (tuple[str, str]): System and user prompt
+
+        Returns:
+            Optional[str]: Cached raw response, or None if there is none
+        """
+        if (response := self._llm_response_cache.get(key)) is not None:
+            self._llm_response_cache.move_to_end(key)
+        return response
+
+    def _cache_llm_response(self, key: tuple[str, str], response: str) -> None:
+        """Store an LLM response, evicting the least recently used ones beyond llm_response_cache_size.
+
+        Args:
+            key (tuple[str, str]): System and user prompt
+            response (str): Raw LLM response
+        """
+        if self.llm_response_cache_size <= 0:
+            return
+        self._llm_response_cache[key] = response
+        self._llm_response_cache.move_to_end(key)
+        while len(self._llm_response_cache) > self.llm_response_cache_size:
+            self._llm_response_cache.popitem(last=False)
+
     async def handle_phase_with_llm(self, phase: int, state: StateT_contra, prompts_path: Path) -> Optional[dict]:
         """Handle the phase using the LLM.
 
@@ -339,21 +573,30 @@ class AgentRole(ABC, Generic[StateT_contra], LoggerMixin):
         Returns:
             Optional[dict]: Phase result dictionary or None if phase is not handled
         """
-        system_prompt = self.get_phase_system_prompt(state, prompts_path=prompts_path)
+        # Dump the state once for both prompt templates and the trace
+        context = state.model_dump()
+
+        system_prompt = self.get_phase_system_prompt(state, prompts_path=prompts_path, context=context)
         self.logger.debug("\n+-----SYSTEM PROMPT----+\n" + f"{system_prompt}\n+------------------+")
 
-        user_prompt = self.get_phase_user_prompt(state, prompts_path=prompts_path)
+        user_prompt = self.get_phase_user_prompt(state, prompts_path=prompts_path, context=context)
         self.logger.debug("\n+-----USER PROMPT----+\n" + f"{user_prompt}\n+------------------+")
 
+        cache_key = (system_prompt, user_prompt)
+        if (response := self._get_cached_llm_response(cache_key)) is not None:
+            self.logger.debug(f"Reusing cached LLM response for phase {phase}")
+            return self.parse_phase_llm_response(response, state)
+
         messages = self.llm.build_messages(system_prompt, user_prompt)
 
         try:
             response = await self.llm.get_response(
                 messages=messages,
                 tracing_extra={
-                    "state": state.model_dump(),
+                    "state": context,
                 },
             )
+            self._cache_llm_response(cache_key, response)
             return self.parse_phase_llm_response(response, state)
         except Exception as e:
             self.logger.error(f"Error getting LLM response: {e}")
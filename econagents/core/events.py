@@ -1,11 +1,13 @@
 from typing import Any
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class Message(BaseModel):
     """A message from the server to the agent."""
 
+    model_config = ConfigDict(frozen=True)
+
     message_type: str
     """Type of message"""
     event_type: str
@@ -1,6 +1,7 @@
 import asyncio
 import logging
 import queue
+import time
 from contextvars import ContextVar
 from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
@@ -16,6 +17,30 @@ from econagents.core.transport import AuthenticationMechanism, SimpleLoginPayloa
 ctx_agent_id: ContextVar[str] = ContextVar("agent_id", default="N/A")
 
 
+class CachedTimeFormatter(logging.Formatter):
+    """Formatter that formats the date and time of records once per second instead of once per record."""
+
+    def __init__(self, fmt: Optional[str] = None, datefmt: Optional[str] = None):
+        super().__init__(fmt, datefmt)
+        # Second and formatted date/time of the last record, replaced as a whole so listener threads can share it
+        self._cached_time: tuple[int, str] = (-1, "")
+
+    def formatTime(self, record, datefmt=None):
+        if datefmt:
+            return super().formatTime(record, datefmt)
+        second = int(record.created)
+        cached_second, formatted = self._cached_time
+        if second != cached_second:
+            formatted = time.strftime(self.default_time_format, self.converter(record.created))
+            self._cached_time = (second, formatted)
+        return self.default_msec_format % (formatted, record.msecs)
+
+
+# Formatters are shared by all loggers
+_AGENT_LOG_FORMATTER = CachedTimeFormatter("%(asctime)s [%(levelname)s] [AGENT %(agent_id)s] %(message)s")
+_GAME_LOG_FORMATTER = CachedTimeFormatter("%(asctime)s [%(levelname)s] %(message)s")
+
+
 class ContextInjectingFilter(logging.Filter):
     """Filter that injects agent_id context into log records."""
 
@@ -24,6 +49,24 @@ class ContextInjectingFilter(logging.Filter):
         return True
 
 
+# Records are only read by the filter, so every logger and handler can share one instance
+_CONTEXT_FILTER = ContextInjectingFilter()
+
+
+class LogRouter(logging.Handler):
+    """Handler that passes each record on to the handlers registered for the logger that created it."""
+
+    def __init__(self):
+        super().__init__()
+        # Handlers by logger name, replaced as a whole so the listener thread never sees a partial update
+        self.routes: dict[str, tuple[logging.Handler, ...]] = {}
+
+    def emit(self, record):
+        for handler in self.routes.get(record.name, ()):
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+
 class GameRunnerConfig(BaseModel):
     """Configuration class for GameRunner."""
 
@@ -43,6 +86,9 @@ class GameRunnerConfig(BaseModel):
     """Directory to store logs"""
     log_level: int = logging.INFO
     """Level of logging to use"""
+    propagate_logs: bool = False
+    """Also pass agent and game log records on to the root logger's handlers (e.g. for pytest's caplog).
+    Off by default, since the runner already writes them to the console and log files."""
     prompts_dir: Path = Path.cwd() / "prompts"
 
     # Authentication
@@ -93,54 +139,71 @@ class GameRunner:
         """
         self.config = config
         self.agents = agents
-        self.game_log_queues: dict[int, queue.Queue] = {}
-        self.game_log_listeners: dict[int, QueueListener] = {}
+        # Agent and game loggers only enqueue records; a single background listener writes them to their
+        # files and the console, so logging doesn't block the event loop
+        self.log_queue: queue.Queue = queue.Queue()
+        self.log_router = LogRouter()
+        self.log_listener: Optional[QueueListener] = None
+        self.game_log_handlers: dict[int, logging.Handler] = {}
 
         # Create log directories if it doesn't exist
         if self.config.logs_dir:
             self.config.logs_dir.mkdir(parents=True, exist_ok=True)
 
-    def _setup_game_log_queue(self, game_id: int) -> queue.Queue:
+    def _get_game_log_handler(self, game_id: int) -> logging.Handler:
         """
-        Set up a logging queue for a game and its associated QueueListener.
+        Get the handler that writes the log of a game, shared by the game and its agents.
 
         Args:
             game_id: Game identifier
 
         Returns:
-            Queue used for logging
+            Handler writing to the game's log file
         """
-        if game_id in self.game_log_queues:
-            return self.game_log_queues[game_id]
-
-        if not self.config.logs_dir:
-            # If no log path, just return a queue without a listener
-            log_queue: queue.Queue = queue.Queue()
-            self.game_log_queues[game_id] = log_queue
-            return log_queue
+        if handler := self.game_log_handlers.get(game_id):
+            return handler
 
         # Create a game-specific directory for all logs related to this game
         game_dir = self.config.logs_dir / f"game_{game_id}"
         game_dir.mkdir(parents=True, exist_ok=True)
 
-        game_log_file = game_dir / "all.log"
-        Path(game_log_file).touch()
+        # Create a file handler for the game log, which creates the file if needed
+        handler = logging.FileHandler(game_dir / "all.log")
+        handler.setFormatter(_AGENT_LOG_FORMATTER)
+        self.game_log_handlers[game_id] = handler
+        return handler
 
-        game_queue: queue.Queue = queue.Queue()
-        self.game_log_queues[game_id] = game_queue
+    def _route_logger(self, logger: logging.Logger, *handlers: logging.Handler) -> None:
+        """
+        Send a logger's records through the shared queue to the given handlers.
 
-        formatter = logging.Formatter("%(asctime)s [%(levelname)s] [AGENT %(agent_id)s] %(message)s")
+        Any handlers the logger had before are replaced, and handlers previously routed for it are closed
+        (except game log handlers, which other loggers share).
 
-        # Create a file handler for the game log
-        file_handler = logging.FileHandler(game_log_file)
-        file_handler.setFormatter(formatter)
+        Args:
+            logger: Logger to configure
+            *handlers: Handlers that write the logger's records from the listener thread
+        """
+        if self.log_listener is None:
+            self.log_listener = QueueListener(self.log_queue, self.log_router)
+            self.log_listener.start()
 
-        # Create and start the listener
-        listener = QueueListener(game_queue, file_handler)
-        listener.start()
-        self.game_log_listeners[game_id] = listener
+        previous = self.log_router.routes.get(logger.name, ())
+        self.log_router.routes = {**self.log_router.routes, logger.name: handlers}
+        shared = set(self.game_log_handlers.values())
+        for handler in previous:
+            if handler not in shared:
+                handler.close()
 
-        return game_queue
+        # Clear existing handlers to avoid duplicates
+        for handler in logger.handlers[:]:
+            logger.removeHandler(handler)
+        logger.addHandler(QueueHandler(self.log_queue))
+        # The routed handlers include a console handler, so only pass records on to the root logger if asked to
+        logger.propagate = self.config.propagate_logs
+        # Add the agent id to records once, on the logger, when they are logged (before reaching any handler)
+        if _CONTEXT_FILTER not in logger.filters:
+            logger.addFilter(_CONTEXT_FILTER)
 
     def get_agent_logger(self, agent_id: int, game_id: int) -> logging.Logger:
         """
@@ -159,9 +222,6 @@ class GameRunner:
             logger.setLevel(self.config.log_level)
             return logger
 
-        # Ensure game log queue is set up
-        game_log_queue = self._setup_game_log_queue(game_id)
-
         # Create a game-specific directory for all logs
         game_dir = self.config.logs_dir / f"game_{game_id}"
         game_dir.mkdir(parents=True, exist_ok=True)
@@ -172,38 +232,16 @@ class GameRunner:
         agent_logger = logging.getLogger(f"agent_{agent_id}")
         agent_logger.setLevel(self.config.log_level)
 
-        # Clear existing handlers to avoid duplicates
-        for handler in agent_logger.handlers[:]:
-            agent_logger.removeHandler(handler)
-
-        # Create or clear the agent log file
-        if agent_log_file.exists():
-            agent_log_file.unlink()
-        Path(agent_log_file).touch()
-
-        formatter = logging.Formatter("%(asctime)s [%(levelname)s] [AGENT %(agent_id)s] %(message)s")
-
-        # Setup file handler for agent log
-        file_handler = logging.FileHandler(agent_log_file)
-        file_handler.setFormatter(formatter)
-
-        # Add context filter
-        context_filter = ContextInjectingFilter()
-        file_handler.addFilter(context_filter)
+        # Setup file handler for agent log, creating or clearing the file
+        file_handler = logging.FileHandler(agent_log_file, mode="w")
+        file_handler.setFormatter(_AGENT_LOG_FORMATTER)
 
         # Console handler
         console_handler = logging.StreamHandler()
-        console_handler.setFormatter(formatter)
-        console_handler.addFilter(context_filter)
+        console_handler.setFormatter(_AGENT_LOG_FORMATTER)
 
-        # Setup queue handler for game log
-        queue_handler = QueueHandler(game_log_queue)
-        queue_handler.addFilter(context_filter)
-
-        # Add all handlers
-        agent_logger.addHandler(file_handler)
-        agent_logger.addHandler(console_handler)
-        agent_logger.addHandler(queue_handler)  # Use queue handler instead of direct file handler
+        # Records go to the agent log, the console and the game log
+        self._route_logger(agent_logger, file_handler, console_handler, self._get_game_log_handler(game_id))
 
         return agent_logger
 
@@ -223,48 +261,45 @@ class GameRunner:
             logger.setLevel(self.config.log_level)
             return logger
 
-        # Ensure game log queue is set up
-        game_log_queue = self._setup_game_log_queue(game_id)
-
         game_logger = logging.getLogger(f"game_{game_id}")
         game_logger.setLevel(self.config.log_level)
 
-        # Clear existing handlers to avoid duplicates
-        for handler in game_logger.handlers[:]:
-            game_logger.removeHandler(handler)
-
-        formatter = logging.Formatter("%(asctime)s [%(levelname)s] %(message)s")
-
-        # Add context filter
-        context_filter = ContextInjectingFilter()
-
         # Console handler
         console_handler = logging.StreamHandler()
-        console_handler.setFormatter(formatter)
-        console_handler.addFilter(context_filter)
+        console_handler.setFormatter(_GAME_LOG_FORMATTER)
 
-        # Setup queue handler for game log
-        queue_handler = QueueHandler(game_log_queue)
-
-        # Add handlers
-        game_logger.addHandler(console_handler)
-        game_logger.addHandler(queue_handler)
+        # Records go to the console and the game log
+        self._route_logger(game_logger, console_handler, self._get_game_log_handler(game_id))
 
         return game_logger
 
     def cleanup_logging(self) -> None:
         """
-        Clean up logging resources, stopping all queue listeners.
+        Clean up logging resources, writing out queued records and stopping the queue listener.
+
+        The agent and game loggers are detached from the queue and propagate to the root logger again,
+        so records logged afterwards are not lost.
         Should be called when shutting down the game runner.
         """
-        for game_id, listener in self.game_log_listeners.items():
+        if self.log_listener is not None:
             try:
-                listener.stop()
+                self.log_listener.stop()
             except Exception as e:
-                print(f"Error stopping listener for game {game_id}: {e}")
-
-        self.game_log_listeners.clear()
-        self.game_log_queues.clear()
+                print(f"Error stopping log listener: {e}")
+            self.log_listener = None
+
+        routes = self.log_router.routes
+        self.log_router.routes = {}
+        for logger_name, handlers in routes.items():
+            logger = logging.getLogger(logger_name)
+            for handler in logger.handlers[:]:
+                if isinstance(handler, QueueHandler) and handler.queue is self.log_queue:
+                    logger.removeHandler(handler)
+            logger.propagate = True
+            for handler in handlers:
+                handler.close()
+
+        self.game_log_handlers.clear()
 
     def _inject_default_config(self, agent_manager: PhaseManager) -> None:
         """
@@ -345,11 +380,11 @@ class GameRunner:
         game_logger.info(f"Running game with ID: {self.config.game_id}")
 
         try:
-            tasks = []
             game_logger.info("Starting simulations")
-
-            for i, agent_manager in enumerate(self.agents, start=1):
-                tasks.append(self.spawn_agent(agent_manager, i))
+            tasks = [
+                asyncio.create_task(self.spawn_agent(agent_manager, i))
+                for i, agent_manager in enumerate(self.agents, start=1)
+            ]
             await asyncio.gather(*tasks)
         except Exception as e:
             game_logger.exception(f"Failed to run game: {e}")
@@ -148,13 +148,20 @@ class AgentManager(LoggerMixin):
     def _extract_message_data(self, raw_message: str) -> Optional[Message]:
         try:
             msg = json.loads(raw_message)
+            if not isinstance(msg, dict):
+                self.logger.error("Invalid message received: expected a JSON object.")
+                return None
             message_type = msg.get("type", "")
             event_type = msg.get("eventType", "")
             data = msg.get("data", {})
         except json.JSONDecodeError:
             self.logger.error("Invalid JSON received.")
             return None
-        return Message(message_type=message_type, event_type=event_type, data=data)
+        if not (isinstance(message_type, str) and isinstance(event_type, str) and isinstance(data, dict)):
+            self.logger.error("Invalid message received: expected string type and eventType and an object as data.")
+            return None
+        # The fields have been type-checked above, so skip pydantic validation
+        return Message.model_construct(message_type=message_type, event_type=event_type, data=data)
 
     async def on_message(self, message: Message):
         """
@@ -166,7 +173,8 @@ class AgentManager(LoggerMixin):
         Args:
             message (Message): Incoming message from the server
         """
-        self.logger.debug(f"<-- AgentManager received message: {message}")
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f"<-- AgentManager received message: {message}")
         if message.message_type == "event":
             await self.on_event(message)
 
@@ -227,28 +235,33 @@ class AgentManager(LoggerMixin):
             message (Message): Incoming event message from the server
         """
         event_type = message.event_type
-        has_specific_handlers = event_type in self._event_handlers
+        execute_hooks = self._execute_hooks
+
+        # Resolve the event-specific hooks and handlers once, with a single lookup each
+        pre_event_hooks = self._pre_event_hooks.get(event_type)
+        event_handlers = self._event_handlers.get(event_type)
+        post_event_hooks = self._post_event_hooks.get(event_type)
 
         # Execute global pre-event hooks
-        await self._execute_hooks(self._global_pre_event_hooks, message, "global pre-event")
+        await execute_hooks(self._global_pre_event_hooks, message, "global pre-event")
 
         # Execute specific pre-event hooks if they exist
-        if event_type in self._pre_event_hooks:
-            await self._execute_hooks(self._pre_event_hooks[event_type], message, f"{event_type} pre-event")
+        if pre_event_hooks:
+            await execute_hooks(pre_event_hooks, message, f"{event_type} pre-event")
 
         # Call global event handlers
-        await self._execute_hooks(self._global_event_handlers, message, "global event")
+        await execute_hooks(self._global_event_handlers, message, "global event")
 
         # Call specific event handlers if they exist
-        if has_specific_handlers:
-            await self._execute_hooks(self._event_handlers[event_type], message, f"{event_type} event")
+        if event_handlers:
+            await execute_hooks(event_handlers, message, f"{event_type} event")
 
         # Execute specific post-event hooks if they exist
-        if event_type in self._post_event_hooks:
-            await self._execute_hooks(self._post_event_hooks[event_type], message, f"{event_type} post-event")
+        if post_event_hooks:
+            await execute_hooks(post_event_hooks, message, f"{event_type} post-event")
 
         # Execute global post-event hooks
-        await self._execute_hooks(self._global_post_event_hooks, message, "global post-event")
+        await execute_hooks(self._global_post_event_hooks, message, "global post-event")
 
     async def _execute_hooks(self, hooks: list[Callable], message: Message, hook_type: str) -> None:
         """Execute a list of hooks/handlers with proper error handling."""
@@ -2,7 +2,7 @@ import asyncio
 import json
 import logging
 import random
-from abc import ABC, abstractmethod
+from abc import ABC
 from typing import Any, Callable, Optional
 from pathlib import Path
 
@@ -80,6 +80,8 @@ class PhaseManager(AgentManager, ABC):
         self._prompts_dir = prompts_dir
         self._continuous_task: Optional[asyncio.Task] = None
         self.in_continuous_phase = False
+        self._rng = random.Random()
+        self._phase_handlers: dict[int, Callable[[int, Any], Any]] = {}
 
         # Register the phase transition handler if we have an event name
         if self._phase_transition_event:
@@ -188,6 +190,9 @@ class PhaseManager(AgentManager, ABC):
         # TODO: is there a better place to do this?
         if self._agent_role:
             self._agent_role.logger = self.logger
+            # Compile the prompt templates before the first phase needs them
+            if self._prompts_dir:
+                self._agent_role.prewarm_templates(self._prompts_dir)
         await super().start()
 
     async def _update_state(self, message: Message):
@@ -198,7 +203,8 @@ class PhaseManager(AgentManager, ABC):
         """
         if self._state:
             self._state.update(message)
-            self.logger.debug(f"Updated state: {self._state}")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(f"Updated state: {self._state}")
 
     async def _on_phase_transition_event(self, message: Message):
         """
@@ -273,7 +279,7 @@ class PhaseManager(AgentManager, ABC):
         try:
             while self.in_continuous_phase:
                 # Wait for a random delay before executing the next action
-                delay = random.randint(self.min_action_delay, self.max_action_delay)
+                delay = self._rng.randint(self.min_action_delay, self.max_action_delay)
                 self.logger.debug(f"Waiting {delay} seconds before next action in phase {phase}")
                 await asyncio.sleep(delay)
 
@@ -288,18 +294,39 @@ class PhaseManager(AgentManager, ABC):
         except Exception as e:
             self.logger.exception(f"Error in continuous-time phase {phase} loop: {e}")
 
-    @abstractmethod
     async def execute_phase_action(self, phase: int):
         """
-        Execute one action for the current phase.
+        Execute an action for the given phase by delegating to the registered handler or agent.
 
-        This is the core method that subclasses must implement to define
-        how to handle actions for a specific phase.
+        Subclasses can override this to customize how actions are produced for a phase.
 
         Args:
             phase (int): The phase number
         """
-        pass
+        payload = None
+
+        if phase in self._phase_handlers:
+            # If we have a registered handler for this phase, use it
+            self.logger.debug(f"Using registered handler for phase {phase}")
+            payload = await self._phase_handlers[phase](phase, self.state)
+        elif self.agent_role and self.agent_role.participates_in_phase(phase):
+            # If we don't have a registered handler but we have an agent that acts in this phase, use the agent
+            self.logger.debug(f"Using agent {self.agent_role.name} handle_phase for phase {phase}")
+            payload = await self.agent_role.handle_phase(phase, self.state, self.prompts_dir)
+
+        if payload:
+            await self.send_message(json.dumps(payload))
+
+    def register_phase_handler(self, phase: int, handler: Callable[[int, Any], Any]):
+        """
+        Register a custom handler for a specific phase.
+
+        Args:
+            phase (int): The phase number
+            handler (Callable[[int, Any], Any]): The function to call when this phase is active
+        """
+        self._phase_handlers[phase] = handler
+        self.logger.debug(f"Registered handler for phase {phase}")
 
     async def on_phase_start(self, phase: int):
         """
@@ -336,7 +363,7 @@ class TurnBasedPhaseManager(PhaseManager):
     """
     A manager for turn-based games that handles phase transitions.
 
-    This manager inherits from PhaseManager and provides a concrete implementation
+    This manager inherits from PhaseManager and uses its handler/agent delegation
     for executing actions in each phase. All phases are treated as turn-based,
     meaning actions are only taken when explicitly triggered (no continuous actions).
 
@@ -376,40 +403,6 @@ class TurnBasedPhaseManager(PhaseManager):
             logger=logger,
             prompts_dir=prompts_dir,
         )
-        # Register phase handlers
-        self._phase_handlers: dict[int, Callable[[int, Any], Any]] = {}
-
-    async def execute_phase_action(self, phase: int):
-        """
-        Execute an action for the given phase by delegating to the registered handler or agent.
-
-        Args:
-            phase (int): The phase number
-        """
-        payload = None
-
-        if phase in self._phase_handlers:
-            # If we have a registered handler for this phase, use it
-            self.logger.debug(f"Using registered handler for phase {phase}")
-            payload = await self._phase_handlers[phase](phase, self.state)
-        elif self.agent_role:
-            # If we don't have a registered handler but we have an agent, use the agent
-            self.logger.debug(f"Using agent {self.agent_role.name} handle_phase for phase {phase}")
-            payload = await self.agent_role.handle_phase(phase, self.state, self.prompts_dir)
-
-        if payload:
-            await self.send_message(json.dumps(payload))
-
-    def register_phase_handler(self, phase: int, handler: Callable[[int, Any], Any]):
-        """
-        Register a custom handler for a specific phase.
-
-        Args:
-            phase (int): The phase number
-            handler (Callable[[int, Any], Any]): The function to call when this phase is active
-        """
-        self._phase_handlers[phase] = handler
-        self.logger.debug(f"Registered handler for phase {phase}")
 
 
 class HybridPhaseManager(PhaseManager):
@@ -467,37 +460,3 @@ class HybridPhaseManager(PhaseManager):
             logger=logger,
             prompts_dir=prompts_dir,
         )
-        # Register phase handlers
-        self._phase_handlers: dict[int, Callable[[int, Any], Any]] = {}
-
-    async def execute_phase_action(self, phase: int):
-        """
-        Execute an action for the given phase by delegating to the registered handler or agent.
-
-        Args:
-            phase (int): The phase number
-        """
-        payload = None
-
-        if phase in self._phase_handlers:
-            # If we have a registered handler for this phase, use it
-            self.logger.debug(f"Using registered handler for phase {phase}")
-            payload = await self._phase_handlers[phase](phase, self.state)
-        elif self.agent_role:
-            # If we don't have a registered handler but we have an agent, use the agent
-            self.logger.debug(f"Using agent {self.agent_role.name} handle_phase for phase {phase}")
-            payload = await self.agent_role.handle_phase(phase, self.state, self.prompts_dir)
-
-        if payload:
-            await self.send_message(json.dumps(payload))
-
-    def register_phase_handler(self, phase: int, handler: Callable[[int, Any], Any]):
-        """
-        Register a custom handler for a specific phase.
-
-        Args:
-            phase (int): The phase number
-            handler (Callable[[int, Any], Any]): The function to call when this phase is active
-        """
-        self._phase_handlers[phase] = handler
-        self.logger.debug(f"Registered handler for phase {phase}")
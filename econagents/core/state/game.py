@@ -1,4 +1,4 @@
-from typing import Any, Callable, Optional, Protocol, Type, TypeVar
+from typing import Any, Callable, ClassVar, Optional, Protocol, Type, TypeVar
 
 from pydantic import BaseModel, ConfigDict
 
@@ -21,6 +21,8 @@ class PropertyMapping(BaseModel):
                       Cannot be used together with phases.
     """
 
+    model_config = ConfigDict(frozen=True)
+
     event_key: str
     state_key: str
     state_type: str = "private"
@@ -90,9 +92,28 @@ class GameState(BaseModel):
     public_information: PublicInformation = EventField(default_factory=PublicInformation)
     """Public information for the game"""
 
+    _state_type_attributes: ClassVar[dict[str, str]] = {
+        "meta": "meta",
+        "private": "private_information",
+        "public": "public_information",
+    }
+    """Attribute that property mappings write into, keyed by mapping state_type"""
+
     def __init__(self, **kwargs: Any):
         super().__init__(**kwargs)
         self._property_mappings = self._get_property_mappings()
+        self._custom_handlers = self.get_custom_handlers()
+
+    def __copy__(self: T) -> T:
+        copied = super().__copy__()
+        # Handlers are usually bound methods, so rebind them to the copy rather than the original
+        copied._custom_handlers = copied.get_custom_handlers()
+        return copied
+
+    def __deepcopy__(self: T, memo: Optional[dict[int, Any]] = None) -> T:
+        copied = super().__deepcopy__(memo)
+        copied._custom_handlers = copied.get_custom_handlers()
+        return copied
 
     def update(self, event: Message) -> None:
         """
@@ -106,12 +127,9 @@ class GameState(BaseModel):
         2. Fall back to property mappings if no custom handler exists
         3. Update state based on property mappings, considering phase restrictions
         """
-        # Get custom event handlers from child class
-        custom_handlers = self.get_custom_handlers()
-
         # Check if there's a custom handler for this event type
-        if event.event_type in custom_handlers:
-            custom_handlers[event.event_type](event.event_type, event.data)
+        if (custom_handler := self._custom_handlers.get(event.event_type)) is not None:
+            custom_handler(event.event_type, event.data)
             return
 
         # Update state based on mappings
@@ -124,15 +142,9 @@ class GameState(BaseModel):
             if mapping.event_key not in event.data:
                 continue
 
-            value = event.data[mapping.event_key]
-
             # Update the appropriate state object based on state_type
-            if mapping.state_type == "meta":
-                setattr(self.meta, mapping.state_key, value)
-            elif mapping.state_type == "private":
-                setattr(self.private_information, mapping.state_key, value)
-            elif mapping.state_type == "public":
-                setattr(self.public_information, mapping.state_key, value)
+            if (attribute := self._state_type_attributes.get(mapping.state_type)) is not None:
+                setattr(getattr(self, attribute), mapping.state_key, event.data[mapping.event_key])
 
     def _get_property_mappings(self) -> list[PropertyMapping]:
         """
@@ -216,6 +228,9 @@ class GameState(BaseModel):
         """
         Override this method to provide custom event handlers.
 
+        It is called once when the state is created (and again for each copy), and the returned mapping is
+        reused for every event.
+
         Returns:
             dict[str, EventHandler]: A mapping of event types to handler functions.
         """
@@ -1,6 +1,9 @@
-from typing import Optional
+from bisect import bisect_left, bisect_right, insort_left
+from itertools import chain, islice
+from operator import attrgetter
+from typing import Any, Callable, ClassVar, Optional
 
-from pydantic import BaseModel, Field, computed_field
+from pydantic import BaseModel, Field, PrivateAttr, computed_field
 
 
 class Order(BaseModel):
@@ -22,51 +25,104 @@ class Trade(BaseModel):
     median: Optional[float] = None
 
 
+_price = attrgetter("price")
+
+
 class MarketState(BaseModel):
     """
     Represents the current state of the market:
     - Active orders in an order book
     - History of recent trades
+
+    The sorted book is kept in sync with ``orders`` by process_event. To change the orders directly,
+    assign a new dict (which rebuilds the book) rather than mutating ``orders`` in place.
     """
 
     orders: dict[int, Order] = Field(default_factory=dict)
     trades: list[Trade] = Field(default_factory=list)
 
+    order_book_depth: ClassVar[Optional[int]] = None
+    """Maximum number of asks and of bids closest to the spread shown in order_book (None shows all)"""
+
+    # Handler for each market event type, so process_event does a single lookup per event
+    _event_handlers: ClassVar[dict[str, Callable[["MarketState", dict], None]]] = {
+        "add-order": lambda market, data: market._on_add_order(data["order"]),
+        "update-order": lambda market, data: market._on_update_order(data["order"]),
+        "delete-order": lambda market, data: market._on_delete_order(data["order"]),
+        "contract-fulfilled": lambda market, data: market._on_contract_fulfilled(data),
+    }
+
+    # Asks and bids kept sorted by ascending price as orders are added and removed.
+    # Orders with the same price are kept newest first, so reading a side backwards gives the
+    # descending, oldest-first order used by order_book.
+    _asks: list[Order] = PrivateAttr(default_factory=list)
+    _bids: list[Order] = PrivateAttr(default_factory=list)
+    # Active orders of each sender, keyed by order ID
+    _orders_by_sender: dict[int, dict[int, Order]] = PrivateAttr(default_factory=dict)
+
+    def model_post_init(self, __context: Any) -> None:
+        self._rebuild_indexes()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name == "orders":
+            self._rebuild_indexes()
+
+    def __copy__(self) -> "MarketState":
+        # A shallow copy would otherwise share the orders dict and the sorted book with the original
+        copied = super().__copy__()
+        copied.orders = dict(self.orders)
+        return copied
+
+    def _rebuild_indexes(self) -> None:
+        """Build the sorted book and the orders of each sender from scratch from the orders dict."""
+        self._asks = []
+        self._bids = []
+        self._orders_by_sender = {}
+        for order in self.orders.values():
+            self._index_order(order)
+
+    @property
+    def sorted_asks(self) -> list[Order]:
+        """Ask orders sorted by ascending price (best ask first)."""
+        return self._asks
+
+    @property
+    def sorted_bids(self) -> list[Order]:
+        """Bid orders sorted by ascending price (best bid last)."""
+        return self._bids
+
+    @property
+    def best_ask(self) -> Optional[Order]:
+        """Lowest-priced ask, the oldest one if several share that price (None if there are no asks)."""
+        if not self._asks:
+            return None
+        return self._asks[bisect_right(self._asks, self._asks[0].price, key=_price) - 1]
+
+    @property
+    def best_bid(self) -> Optional[Order]:
+        """Highest-priced bid, the oldest one if several share that price (None if there are no bids)."""
+        return self._bids[-1] if self._bids else None
+
     @computed_field
     def order_book(self) -> str:
-        asks = sorted(
-            [order for order in self.orders.values() if order.type == "ask"],
-            key=lambda x: x.price,
-            reverse=True,
-        )
-        bids = sorted(
-            [order for order in self.orders.values() if order.type == "bid"],
-            key=lambda x: x.price,
-            reverse=True,
-        )
-        sorted_orders = asks + bids
-        return "\n".join([str(order) for order in sorted_orders])
+        if (depth := self.order_book_depth) is None:
+            sorted_orders = chain(reversed(self._asks), reversed(self._bids))
+        else:
+            sorted_orders = chain(reversed(self._asks[:depth]), islice(reversed(self._bids), depth))
+        return "\n".join(map(str, sorted_orders))
 
     def process_event(self, event_type: str, data: dict):
         """
         Update the MarketState based on the eventType and
         event data from the server.
         """
-        if event_type == "add-order":
-            self._on_add_order(data["order"])
-
-        elif event_type == "update-order":
-            self._on_update_order(data["order"])
-
-        elif event_type == "delete-order":
-            self._on_delete_order(data["order"])
-
-        elif event_type == "contract-fulfilled":
-            self._on_contract_fulfilled(data)
+        if handler := self._event_handlers.get(event_type):
+            handler(self, data)
 
     def get_orders_from_player(self, player_id: int) -> list[Order]:
         """Get all orders from a specific player."""
-        return [order for order in self.orders.values() if order.sender == player_id]
+        return list(self._orders_by_sender.get(player_id, {}).values())
 
     def _on_add_order(self, order_data: dict):
         """
@@ -83,18 +139,19 @@ class MarketState(BaseModel):
             condition=order_data["condition"],
             now=order_data.get("now", False),
         )
+        if (previous := self.orders.get(order_id)) is not None:
+            self._unindex_order(previous)
         self.orders[order_id] = new_order
+        self._index_order(new_order)
 
     def _on_update_order(self, order_data: dict):
         """
         The server is telling us the order's quantity or other fields
         have changed (often due to partial fills).
         """
-        order_id = order_data["id"]
-        if order_id in self.orders:
-            existing = self.orders[order_id]
+        # Orders are updated in place; Order does not validate assignments
+        if (existing := self.orders.get(order_data["id"])) is not None:
             existing.quantity = order_data.get("quantity", existing.quantity)
-            self.orders[order_id] = existing
 
     def _on_delete_order(self, order_data: dict):
         """
@@ -102,8 +159,42 @@ class MarketState(BaseModel):
         from the order book (fully filled or canceled).
         """
         order_id = order_data["id"]
-        if order_id in self.orders:
-            del self.orders[order_id]
+        if (order := self.orders.pop(order_id, None)) is not None:
+            self._unindex_order(order)
+
+    def _index_order(self, order: Order):
+        """Add an order to the sorted book and to its sender's orders."""
+        self._add_to_book(order)
+        self._orders_by_sender.setdefault(order.sender, {})[order.id] = order
+
+    def _unindex_order(self, order: Order):
+        """Remove an order from the sorted book and from its sender's orders."""
+        self._remove_from_book(order)
+        if (sender_orders := self._orders_by_sender.get(order.sender)) is not None:
+            sender_orders.pop(order.id, None)
+            if not sender_orders:
+                del self._orders_by_sender[order.sender]
+
+    def _get_book(self, order_type: str) -> Optional[list[Order]]:
+        if order_type == "ask":
+            return self._asks
+        if order_type == "bid":
+            return self._bids
+        return None
+
+    def _add_to_book(self, order: Order):
+        """Insert an order into its side of the book, before orders with the same price."""
+        if (book := self._get_book(order.type)) is not None:
+            insort_left(book, order, key=_price)
+
+    def _remove_from_book(self, order: Order):
+        """Remove an order from its side of the book."""
+        if (book := self._get_book(order.type)) is None:
+            return
+        for index in range(bisect_left(book, order.price, key=_price), len(book)):
+            if book[index] is order:
+                del book[index]
+                return
 
     def _on_contract_fulfilled(self, data: dict):
         """
@@ -42,6 +42,9 @@ class WebSocketTransport(LoggerMixin):
     and reporting received messages to a callback function.
     """
 
+    flush_timeout: float = 5.0
+    """Seconds to wait for queued messages to be sent when stopping, before dropping them"""
+
     def __init__(
         self,
         url: str,
@@ -69,6 +72,8 @@ class WebSocketTransport(LoggerMixin):
         self.on_message_callback = on_message_callback
         self.ws: Optional[ClientConnection] = None
         self._running = False
+        self._send_queue: Optional[asyncio.Queue[str]] = None
+        self._writer_task: Optional[asyncio.Task] = None
 
     async def connect(self) -> bool:
         """Establish the WebSocket connection and authenticate."""
@@ -101,7 +106,8 @@ class WebSocketTransport(LoggerMixin):
                 message_str = await self.ws.recv()
                 if self.on_message_callback:
                     # Call the callback, supporting both sync and async functions
-                    self.logger.debug(f"<-- Transport received: {message_str}")
+                    if self.logger.isEnabledFor(logging.DEBUG):
+                        self.logger.debug(f"<-- Transport received: {message_str}")
                     result = self.on_message_callback(message_str)
                     # If the callback is a coroutine function, await it
                     if asyncio.iscoroutine(result):
@@ -113,19 +119,74 @@ class WebSocketTransport(LoggerMixin):
                 self.logger.exception("Error in receive loop.")
                 break
         self._running = False
+        # Nothing more can be sent once the connection is gone, so don't leave the writer task behind
+        await self._stop_writer(flush=False)
 
     async def send(self, message: str):
-        """Send a raw string message to the WebSocket."""
+        """
+        Queue a raw string message to be sent to the WebSocket.
+
+        Messages are written in order by a single writer task, so callers don't
+        wait for the socket write to complete. Messages that cannot be sent are
+        logged as errors by the writer task.
+        """
         if self.ws:
+            if self._send_queue is None or self._writer_task is None or self._writer_task.done():
+                self._send_queue = asyncio.Queue()
+                self._writer_task = asyncio.create_task(self._write_loop(self._send_queue))
+            self._send_queue.put_nowait(message)
+
+    async def _write_loop(self, queue: asyncio.Queue[str]):
+        """Drain the outbound queue, writing each message to the WebSocket."""
+        while True:
+            message = await queue.get()
             try:
-                self.logger.debug(f"--> Transport sending: {message}")
-                await self.ws.send(message)
+                if self.ws:
+                    if self.logger.isEnabledFor(logging.DEBUG):
+                        self.logger.debug(f"--> Transport sending: {message}")
+                    await self.ws.send(message)
+            except ConnectionClosed:
+                self.logger.error(f"Connection closed, dropped message: {message}")
+                self._drop_pending(queue, "connection closed")
+                return
             except Exception:
-                self.logger.exception("Error sending message.")
+                self.logger.exception(f"Error sending message, dropped message: {message}")
+            finally:
+                queue.task_done()
+
+    def _drop_pending(self, queue: asyncio.Queue[str], reason: str):
+        """Empty the outbound queue, logging the messages that will not be sent."""
+        dropped = []
+        while not queue.empty():
+            dropped.append(queue.get_nowait())
+            queue.task_done()
+        if dropped:
+            self.logger.error(f"Dropped {len(dropped)} unsent message(s) ({reason}): {dropped}")
+
+    async def _stop_writer(self, flush: bool = True):
+        """Stop the writer task, first waiting up to flush_timeout for pending messages to be sent if flush is set."""
+        if self._writer_task is None:
+            return
+        queue = self._send_queue
+        if flush and queue is not None and not self._writer_task.done():
+            try:
+                await asyncio.wait_for(queue.join(), timeout=self.flush_timeout)
+            except asyncio.TimeoutError:
+                self.logger.error(f"Timed out after {self.flush_timeout}s flushing outbound messages.")
+        self._writer_task.cancel()
+        try:
+            await self._writer_task
+        except asyncio.CancelledError:
+            pass
+        if queue is not None:
+            self._drop_pending(queue, "transport stopped")
+        self._writer_task = None
+        self._send_queue = None
 
     async def stop(self):
         """Gracefully close the WebSocket connection."""
         self._running = False
+        await self._stop_writer()
         if self.ws:
             await self.ws.close()
             self.logger.info("WebSocketTransport: connection closed.")
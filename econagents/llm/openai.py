@@ -1,3 +1,5 @@
+import asyncio
+from contextlib import nullcontext
 from typing import Any, Optional
 
 from langsmith import traceable
@@ -14,10 +16,36 @@ class ChatOpenAI:
         self,
         model_name: str = "gpt-4o",
         api_key: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
     ) -> None:
-        """Initialize the LLM interface."""
+        """Initialize the LLM interface.
+
+        Args:
+            model_name (str): The model to query.
+            api_key (Optional[str]): The OpenAI API key. Defaults to the OPENAI_API_KEY environment variable.
+            max_concurrency (Optional[int]): Maximum number of requests in flight at once through this
+                instance, e.g. to stay under rate limits when many agents share it. Unlimited by default.
+        """
         self.model_name = model_name
         self.api_key = api_key
+        self.max_concurrency = max_concurrency
+        self._client: Optional[AsyncOpenAI] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    @property
+    def client(self) -> AsyncOpenAI:
+        """The traced OpenAI client, created on first use and reused across requests."""
+        if self._client is None:
+            self._client = wrap_openai(AsyncOpenAI(api_key=self.api_key))
+        return self._client
+
+    def _request_slot(self):
+        """Context manager that waits for a free request slot when max_concurrency is set."""
+        if self.max_concurrency is None:
+            return nullcontext()
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
 
     def build_messages(self, system_prompt: str, user_prompt: str):
         """Build messages for the LLM.
@@ -50,12 +78,12 @@ class ChatOpenAI:
         Returns:
             str: The response from the LLM.
         """
-        client = wrap_openai(AsyncOpenAI(api_key=self.api_key))
-        response = await client.chat.completions.create(
-            messages=messages,  # type: ignore
-            model=self.model_name,
-            response_format={"type": "json_object"},
-            langsmith_extra=tracing_extra,
-            **kwargs,
-        )
+        async with self._request_slot():
+            response = await self.client.chat.completions.create(
+                messages=messages,  # type: ignore
+                model=self.model_name,
+                response_format={"type": "json_object"},
+                langsmith_extra=tracing_extra,
+                **kwargs,
+            )
         return response.choices[0].message.content
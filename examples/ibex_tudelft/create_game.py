@@ -1,7 +1,9 @@
+import copy
 import json
 import logging
 import os
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
@@ -16,6 +18,9 @@ HOSTNAME = os.getenv("HOSTNAME")
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Shared session so repeated API calls reuse the same connection
+_session = requests.Session()
+
 
 def calculate_total_agents(game_params: dict[str, Any]) -> int:
     """Calculate total number of agents from game parameters."""
@@ -26,11 +31,17 @@ def calculate_total_agents(game_params: dict[str, Any]) -> int:
     )
 
 
+@lru_cache(maxsize=8)
+def _read_game_specs(specs_path: Path) -> dict[str, Any]:
+    with specs_path.open("r") as f:
+        return json.load(f)
+
+
 def load_game_specs(specs_path: Path) -> dict[str, Any]:
     """Load game specifications from JSON file."""
     try:
-        with specs_path.open("r") as f:
-            return json.load(f)
+        # Callers modify the specs, so hand out a copy of the cached file contents
+        return copy.deepcopy(_read_game_specs(specs_path))
     except Exception as e:
         logger.error(f"Failed to load game specs: {e}")
         raise
@@ -46,7 +57,7 @@ def create_game(base_url: str, username: str, password: str, game_params: dict[s
     headers = {"Content-Type": "application/json"}
 
     try:
-        response = requests.post(endpoint, json=payload, headers=headers, timeout=30)
+        response = _session.post(endpoint, json=payload, headers=headers, timeout=30)
         response.raise_for_status()
         return response.json()
     except requests.exceptions.RequestException as e:
@@ -59,11 +70,13 @@ def get_recovery_code(base_url: str, game_id: int) -> str:
     endpoint = f"{base_url}/api/v1/games/get-recovery"
 
     try:
-        response = requests.get(f"{endpoint}?game_id={game_id}", timeout=30)
+        response = _session.get(f"{endpoint}?game_id={game_id}", timeout=30)
         response.raise_for_status()
         return response.json()["data"]["recovery"]
     except requests.exceptions.RequestException as e:
-        logger.error(f"Failed to get recovery code: {e}, response: {response.json()}")
+        # The request may have failed before any response was received
+        response_text = e.response.text if e.response is not None else None
+        logger.error(f"Failed to get recovery code: {e}, response: {response_text}")
         raise
 
 
@@ -120,9 +133,12 @@ def create_game_from_specs(
             game_id = result["data"]["id"]
             logger.info(f"Game created successfully! Game ID: {game_id}")
 
-            # Get recovery codes for all agents
+            # Get recovery codes for all agents, one at a time since the server hands out a new code per request
             logger.info("Getting recovery codes for all agents...")
             recovery_codes = [get_recovery_code(base_url, game_id) for _ in range(num_agents)]
+            if len(set(recovery_codes)) != len(recovery_codes):
+                logger.error(f"Received duplicate recovery codes: {recovery_codes}")
+                raise ValueError("Received duplicate recovery codes")
 
             # Create login payloads for each agent
             login_payloads = []
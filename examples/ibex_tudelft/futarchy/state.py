@@ -1,10 +1,12 @@
-from typing import Any, Optional
+from functools import cached_property
+from typing import Any, ClassVar, Optional
 
 from pydantic import Field, computed_field
 
 from econagents.core.state.fields import EventField
-from econagents.core.state.game import EventHandler, GameState, MetaInformation, PrivateInformation, PublicInformation
+from econagents.core.state.game import MetaInformation, PrivateInformation, PublicInformation
 from econagents.core.state.market import MarketState
+from examples.ibex_tudelft.state import CONDITION_KEYS, ROLE_NAMES, IbexGameState, declaration_fields, percentile
 
 # EventField lets you specify the event key of the event data in the message
 # event_key is the key of the event data in the message. If not specified, the event key is the field name.
@@ -12,7 +14,6 @@ from econagents.core.state.market import MarketState
 # exclude_events is used to exclude the field from the events that trigger an update, so it is not updated when an event is processed
 # events are the events that trigger an update, if not specified, all events will trigger an update if they have the event key
 
-
 class FMeta(MetaInformation):
     # These fields are required in MetaInformation
     game_id: int = EventField(default=0, exclude_from_mapping=True)
@@ -54,28 +55,33 @@ class FPublic(PublicInformation):
         return self.conditions[self.winning_condition] if self.conditions else {}
 
 
-class FGameState(GameState):
+class FGameState(IbexGameState):
     meta: FMeta = Field(default_factory=FMeta)
     private_information: FPrivate = Field(default_factory=FPrivate)
     public_information: FPublic = Field(default_factory=FPublic)
 
-    # This is needed because the game_id is not in the event data
-    def __init__(self, **kwargs: Any):
-        super().__init__(**kwargs)
-        self.meta.game_id = kwargs.get("game_id", 0)
-
-    # This is needed to build the order book
-    def get_custom_handlers(self) -> dict[str, EventHandler]:
-        """Provide custom event handlers for market events"""
-        market_events = ["add-order", "update-order", "delete-order", "contract-fulfilled", "asset-movement"]
-        return {event: self._handle_market_event for event in market_events}
-
-    # This is needed to build the order book
-    def _handle_market_event(self, event_type: str, data: dict[str, Any]) -> None:
-        """Handle market-related events by delegating to MarketState"""
-        self.public_information.market_state.process_event(event_type=event_type, data=data)
-
-        if event_type == "asset-movement":
-            winning_condition = self.public_information.winning_condition
-            self.private_information.wallet[winning_condition]["balance"] = data["balance"]
-            self.private_information.wallet[winning_condition]["shares"] = data["shares"]
+    _cached_views: ClassVar[tuple[str, ...]] = (*IbexGameState._cached_views, "conditional_declaration_summary")
+
+    @computed_field  # type: ignore[prop-decorator]
+    @cached_property
+    def conditional_declaration_summary(self) -> list[dict[str, Any]]:
+        """Declarations under both conditions, with percentiles for developers."""
+        developer_bounds = self.public_information.boundaries.get("developer", {})
+        summary = []
+        for declaration in self.private_information.declarations:
+            role, number, declared = declaration_fields(declaration)
+            declared_values = declared[: len(CONDITION_KEYS)]
+            percentiles = None
+            if role == 2:
+                percentiles = [
+                    percentile(value, developer_bounds.get(key)) for value, key in zip(declared_values, CONDITION_KEYS)
+                ]
+            summary.append(
+                {
+                    "number": number,
+                    "role_name": ROLE_NAMES.get(role, "Owner"),
+                    "declared_values": declared_values,
+                    "percentiles": percentiles,
+                }
+            )
+        return summary
@@ -3,8 +3,9 @@ from typing import Any, Optional
 from pydantic import Field, computed_field
 
 from econagents.core.state.fields import EventField
-from econagents.core.state.game import EventHandler, GameState, MetaInformation, PrivateInformation, PublicInformation
+from econagents.core.state.game import MetaInformation, PrivateInformation, PublicInformation
 from econagents.core.state.market import MarketState
+from examples.ibex_tudelft.state import IbexGameState
 
 # EventField lets you specify the event key of the event data in the message
 # event_key is the key of the event data in the message. If not specified, the event key is the field name.
@@ -12,7 +13,6 @@ from econagents.core.state.market import MarketState
 # exclude_events is used to exclude the field from the events that trigger an update, so it is not updated when an event is processed
 # events are the events that trigger an update, if not specified, all events will trigger an update if they have the event key
 
-
 class HLMeta(MetaInformation):
     # These fields are required in MetaInformation
     game_id: int = EventField(default=0, exclude_from_mapping=True)
@@ -54,28 +54,7 @@ class HLPublic(PublicInformation):
         return self.conditions[self.winning_condition] if self.conditions else {}
 
 
-class HLGameState(GameState):
+class HLGameState(IbexGameState):
     meta: HLMeta = Field(default_factory=HLMeta)
     private_information: HLPrivate = Field(default_factory=HLPrivate)
     public_information: HLPublic = Field(default_factory=HLPublic)
-
-    # This is needed because the game_id is not in the event data
-    def __init__(self, **kwargs: Any):
-        super().__init__(**kwargs)
-        self.meta.game_id = kwargs.get("game_id", 0)
-
-    # This is needed to build the order book
-    def get_custom_handlers(self) -> dict[str, EventHandler]:
-        """Provide custom event handlers for market events"""
-        market_events = ["add-order", "update-order", "delete-order", "contract-fulfilled", "asset-movement"]
-        return {event: self._handle_market_event for event in market_events}
-
-    # This is needed to build the order book
-    def _handle_market_event(self, event_type: str, data: dict[str, Any]) -> None:
-        """Handle market-related events by delegating to MarketState"""
-        self.public_information.market_state.process_event(event_type=event_type, data=data)
-
-        if event_type == "asset-movement":
-            winning_condition = self.public_information.winning_condition
-            self.private_information.wallet[winning_condition]["balance"] = data["balance"]
-            self.private_information.wallet[winning_condition]["shares"] = data["shares"]
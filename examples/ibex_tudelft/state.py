@@ -0,0 +1,124 @@
+from functools import cached_property
+from operator import itemgetter
+from typing import Any, ClassVar, Optional
+
+from pydantic import computed_field
+
+from econagents.core.events import Message
+from econagents.core.state.game import EventHandler, GameState
+
+# Constants, helpers and the base game state shared by the IBEX games
+
+ROLE_NAMES = {1: "Speculator", 2: "Developer"}
+CONDITION_KEYS = ("noProject", "projectA")
+declaration_fields = itemgetter("role", "number", "d")
+# Events that update the order book, handled by IbexGameState._handle_market_event
+MARKET_EVENTS = frozenset({"add-order", "update-order", "delete-order", "contract-fulfilled", "asset-movement"})
+
+
+def value_at(values: list[Any], index: int) -> Any:
+    """Item at index, or None if the list does not have it yet."""
+    return values[index] if 0 <= index < len(values) else None
+
+
+def percentile(value: float, bounds: Optional[dict[str, Any]]) -> Optional[float]:
+    """Position of a declared value within its role's value boundaries, as a percentage."""
+    if not bounds or not (span := bounds["high"] - bounds["low"]):
+        return None
+    return round((value - bounds["low"]) / span * 100, 2)
+
+
+class IbexGameState(GameState):
+    """Game state shared by the IBEX games, with views of the state under the winning condition.
+
+    Subclasses declare the meta, private and public information of their game. The views are computed on
+    first use and cached until update() processes an event that changes the fields they are computed from.
+    """
+
+    _cached_views: ClassVar[tuple[str, ...]] = (
+        "my_wallet",
+        "my_public_signal",
+        "my_private_signal",
+        "declaration_summary",
+    )
+    # Fields the cached views are computed from
+    _view_dependencies: ClassVar[frozenset[str]] = frozenset(
+        {"wallet", "value_signals", "public_signal", "declarations", "boundaries", "winning_condition"}
+    )
+
+    # This is needed because the game_id is not in the event data
+    def __init__(self, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.meta.game_id = kwargs.get("game_id", 0)
+        # Event keys that update the fields the cached views are computed from
+        self._view_event_keys = frozenset(
+            mapping.event_key for mapping in self._property_mappings if mapping.state_key in self._view_dependencies
+        )
+
+    def update(self, event: Message) -> None:
+        super().update(event)
+        if not self._view_event_keys.isdisjoint(event.data):
+            self._clear_cached_views()
+
+    def _clear_cached_views(self) -> None:
+        """Drop the cached views so they are computed again on next use."""
+        for name in self._cached_views:
+            self.__dict__.pop(name, None)
+
+    @computed_field  # type: ignore[prop-decorator]
+    @cached_property
+    def my_wallet(self) -> Optional[dict[str, Any]]:
+        """The player's wallet under the winning condition."""
+        return value_at(self.private_information.wallet, self.public_information.winning_condition)
+
+    @computed_field  # type: ignore[prop-decorator]
+    @cached_property
+    def my_public_signal(self) -> Optional[float]:
+        """The public value signal under the winning condition."""
+        return value_at(self.public_information.public_signal, self.public_information.winning_condition)
+
+    @computed_field  # type: ignore[prop-decorator]
+    @cached_property
+    def my_private_signal(self) -> Optional[float]:
+        """The player's private value signal under the winning condition."""
+        return value_at(self.private_information.value_signals, self.public_information.winning_condition)
+
+    @computed_field  # type: ignore[prop-decorator]
+    @cached_property
+    def declaration_summary(self) -> list[dict[str, Any]]:
+        """Declarations under the winning condition, with their percentile within the declaring role's boundaries."""
+        winning_condition = self.public_information.winning_condition
+        boundaries = self.public_information.boundaries
+        key = CONDITION_KEYS[1] if winning_condition == 1 else CONDITION_KEYS[0]
+        developer_bounds = boundaries.get("developer", {}).get(key)
+        owner_bounds = boundaries.get("owner", {}).get(key)
+        summary = []
+        for declaration in self.private_information.declarations:
+            role, number, declared = declaration_fields(declaration)
+            declared_value = declared[winning_condition]
+            bounds = developer_bounds if role == 2 else owner_bounds
+            summary.append(
+                {
+                    "number": number,
+                    "role_name": ROLE_NAMES.get(role, "Owner"),
+                    "declared_value": declared_value,
+                    "percentile": percentile(declared_value, bounds),
+                }
+            )
+        return summary
+
+    # This is needed to build the order book
+    def get_custom_handlers(self) -> dict[str, EventHandler]:
+        """Provide custom event handlers for market events"""
+        return dict.fromkeys(MARKET_EVENTS, self._handle_market_event)
+
+    # This is needed to build the order book
+    def _handle_market_event(self, event_type: str, data: dict[str, Any]) -> None:
+        """Handle market-related events by delegating to MarketState"""
+        self.public_information.market_state.process_event(event_type=event_type, data=data)
+
+        if event_type == "asset-movement":
+            winning_condition = self.public_information.winning_condition
+            self.private_information.wallet[winning_condition]["balance"] = data["balance"]
+            self.private_information.wallet[winning_condition]["shares"] = data["shares"]
+            self.__dict__.pop("my_wallet", None)
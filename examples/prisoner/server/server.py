@@ -146,6 +146,22 @@ class PrisonersDilemmaServer:
         self.host = host
         self.port = port
         self.games: Dict[int, PrisonersDilemmaGame] = {}
+        # Game specs files don't change once created, so each one is read once
+        self.game_specs: Dict[int, Dict[str, Any]] = {}
+
+    def load_game_specs(self, game_id: int) -> Optional[Dict[str, Any]]:
+        """Load the specs of a game, or None if the game does not exist."""
+        if game_id in self.game_specs:
+            return self.game_specs[game_id]
+
+        game_specs_path = SPECS_PATH / f"game_{game_id}.json"
+        if not game_specs_path.exists():
+            return None
+
+        with game_specs_path.open("r") as f:
+            game_specs = json.load(f)
+        self.game_specs[game_id] = game_specs
+        return game_specs
 
     async def handle_websocket(self, websocket: ServerConnection) -> None:
         """Handle WebSocket connections."""
@@ -168,15 +184,12 @@ class PrisonersDilemmaServer:
                             await self.send_error(websocket, "Game ID and recovery code are required")
                             continue
 
-                        game_specs_path = SPECS_PATH / f"game_{game_id}.json"
+                        game_specs = self.load_game_specs(game_id)
 
-                        if not game_specs_path.exists():
+                        if game_specs is None:
                             await self.send_error(websocket, f"Game {game_id} does not exist")
                             continue
 
-                        with game_specs_path.open("r") as f:
-                            game_specs = json.load(f)
-
                         if recovery not in game_specs["recovery_codes"]:
                             await self.send_error(websocket, f"Invalid recovery code: {recovery}")
                             continue
@@ -2,7 +2,9 @@ import json
 import logging
 import pytest
 from pathlib import Path
+from types import MappingProxyType
 from typing import ClassVar, Dict, Optional
+from unittest.mock import MagicMock
 
 import nest_asyncio
 from pytest_mock import MockFixture
@@ -44,43 +46,62 @@ class MockAgentRole(AgentRole[GameStateProtocol]):
         return response_text
 
 
-@pytest.fixture
+# Test prompt templates, by file name
+PROMPT_TEMPLATES = MappingProxyType(
+    {
+        "test_agent_system.jinja2": "System prompt for {{ meta.phase }}",
+        "test_agent_user.jinja2": "User prompt for {{ meta.phase }}",
+        # Phase-specific prompts
+        "test_agent_system_phase_1.jinja2": "Phase 1 system prompt",
+        "test_agent_user_phase_1.jinja2": "Phase 1 user prompt",
+        # General prompts for all roles
+        "all_system.jinja2": "General system prompt for {{ meta.phase }}",
+    }
+)
+
+
+def write_prompt_templates(prompts_dir: Path) -> Path:
+    """Write the test prompt templates into a directory."""
+    for name, template in PROMPT_TEMPLATES.items():
+        (prompts_dir / name).write_text(template)
+    return prompts_dir
+
+
+@pytest.fixture(scope="session")
 def logger():
     """Provide a logger for tests."""
     return logging.getLogger("test_logger")
 
 
+@pytest.fixture(scope="session")
+def prompts_path(tmp_path_factory):
+    """Create a directory with test prompt files, shared by all tests that only read it."""
+    return write_prompt_templates(tmp_path_factory.mktemp("prompts"))
+
+
 @pytest.fixture
-def prompts_path(tmp_path):
-    """Create a temporary directory with test prompt files."""
+def writable_prompts_path(tmp_path):
+    """Create a directory with test prompt files for a test that adds or edits templates."""
     prompts_dir = tmp_path / "prompts"
     prompts_dir.mkdir()
+    return write_prompt_templates(prompts_dir)
 
-    # Create some test prompt templates
-    system_prompt = prompts_dir / "test_agent_system.jinja2"
-    system_prompt.write_text("System prompt for {{ meta.phase }}")
-
-    user_prompt = prompts_dir / "test_agent_user.jinja2"
-    user_prompt.write_text("User prompt for {{ meta.phase }}")
 
-    # Phase-specific prompts
-    phase_system_prompt = prompts_dir / "test_agent_system_phase_1.jinja2"
-    phase_system_prompt.write_text("Phase 1 system prompt")
-
-    phase_user_prompt = prompts_dir / "test_agent_user_phase_1.jinja2"
-    phase_user_prompt.write_text("Phase 1 user prompt")
-
-    # General prompts for all roles
-    all_system_prompt = prompts_dir / "all_system.jinja2"
-    all_system_prompt.write_text("General system prompt for {{ meta.phase }}")
-
-    return prompts_dir
+@pytest.fixture
+def mock_llm():
+    """Provide a mock LLM whose methods record their calls."""
+    llm = MockLLM()
+    llm.build_messages = MagicMock(wraps=llm.build_messages)
+    llm.get_response = MagicMock(wraps=llm.get_response)
+    return llm
 
 
 @pytest.fixture
-def mock_agent_role(logger):
-    """Provide a mock agent instance."""
-    return MockAgentRole(logger=logger)
+def mock_agent_role(logger, mock_llm):
+    """Provide a mock agent instance with its own mock LLM."""
+    agent = MockAgentRole(logger=logger)
+    agent.llm = mock_llm
+    return agent
 
 
 @pytest.fixture
@@ -2,11 +2,17 @@ import json
 from typing import ClassVar
 
 import pytest
+from jinja2 import FileSystemBytecodeCache
+from jinja2.exceptions import SecurityError
+from jinja2.sandbox import SandboxedEnvironment
 
 from econagents.core.agent_role import AgentRole
 from econagents.core.state.game import GameStateProtocol
 from tests.conftest import MockLLM
 
+# LLM response holding a valid JSON object
+_VALID_JSON = '{"message": "Hello"}'
+
 
 class TestAgentInitialization:
     """Tests for Agent initialization."""
@@ -15,8 +21,19 @@ class TestAgentInitialization:
         """Test that the agent initializes correctly."""
         assert mock_agent_role.name == "test_agent"
         assert mock_agent_role.role == 1
-        assert mock_agent_role.task_phases == []
-        assert mock_agent_role.task_phases_excluded == []
+        assert mock_agent_role.task_phases == frozenset()
+        assert mock_agent_role.task_phases_excluded == frozenset()
+
+    def test_task_phases_stored_as_frozensets(self):
+        """Test that task phase lists given by a role class are turned into frozensets."""
+
+        class PhasedAgent(AgentRole):
+            role = 1
+            name = "phased_agent"
+            task_phases = [3, 6, 8]
+
+        assert PhasedAgent.task_phases == frozenset({3, 6, 8})
+        assert PhasedAgent.task_phases_excluded == frozenset()
 
     def test_initialization_with_both_phase_lists(self, logger, prompts_path):
         """Test that initializing with both task_phases and task_phases_excluded raises an error."""
@@ -32,6 +49,19 @@ class TestAgentInitialization:
 
         assert "Only one of task_phases or task_phases_excluded should be specified" in str(exc_info.value)
 
+    def test_participates_in_phase(self, mock_agent_role):
+        """Test which phases the agent acts in for each kind of phase list."""
+        assert mock_agent_role.participates_in_phase(0)
+
+        mock_agent_role.task_phases = [1, 2]
+        assert mock_agent_role.participates_in_phase(1)
+        assert not mock_agent_role.participates_in_phase(0)
+
+        mock_agent_role.task_phases = []
+        mock_agent_role.task_phases_excluded = [0]
+        assert not mock_agent_role.participates_in_phase(0)
+        assert mock_agent_role.participates_in_phase(1)
+
 
 class TestPromptHandling:
     """Tests for prompt handling."""
@@ -50,6 +80,146 @@ class TestPromptHandling:
         )
         assert result == "Phase 1 system prompt"
 
+    def test_render_prompt_reuses_compiled_template(self, mock_agent_role, game_state, prompts_path):
+        """Test that repeated renders reuse the cached template environment."""
+        context = game_state.model_dump()
+        mock_agent_role.render_prompt(context=context, prompt_type="system", phase=0, prompts_path=prompts_path)
+        env = mock_agent_role._get_template_environment(prompts_path)
+        template = env.get_template("test_agent_system.jinja2")
+
+        result = mock_agent_role.render_prompt(
+            context=context, prompt_type="system", phase=0, prompts_path=prompts_path
+        )
+
+        assert result == "System prompt for 0"
+        assert mock_agent_role._get_template_environment(prompts_path) is env
+        assert env.get_template("test_agent_system.jinja2") is template
+
+    def test_render_prompt_caches_static_templates(self, mock_agent_role, phase1_game_state, prompts_path):
+        """Test that templates without variables are rendered once and reused."""
+        context = phase1_game_state.model_dump()
+        mock_agent_role.render_prompt(context=context, prompt_type="system", phase=1, prompts_path=prompts_path)
+        mock_agent_role.render_prompt(context=context, prompt_type="system", phase=0, prompts_path=prompts_path)
+        env = mock_agent_role._get_template_environment(prompts_path)
+
+        static_template = env.get_template("test_agent_system_phase_1.jinja2")
+        dynamic_template = env.get_template("test_agent_system.jinja2")
+        assert mock_agent_role._static_prompts[static_template] == "Phase 1 system prompt"
+        assert mock_agent_role._static_prompts[dynamic_template] is None
+
+    def test_clear_template_cache_reloads_edited_templates(
+        self, mock_agent_role, phase1_game_state, writable_prompts_path
+    ):
+        """Test that edited templates are only picked up after clearing the template cache."""
+        context = phase1_game_state.model_dump()
+
+        def render():
+            return mock_agent_role.render_prompt(
+                context=context, prompt_type="system", phase=1, prompts_path=writable_prompts_path
+            )
+
+        assert render() == "Phase 1 system prompt"
+
+        (writable_prompts_path / "test_agent_system_phase_1.jinja2").write_text("Edited phase 1 system prompt")
+        assert render() == "Phase 1 system prompt"
+
+        AgentRole.clear_template_cache()
+        assert render() == "Edited phase 1 system prompt"
+
+    def test_resolve_prompt_file_is_cached(self, mock_agent_role, writable_prompts_path):
+        """Test that prompt directories are listed once until the template cache is cleared."""
+
+        def resolve():
+            return mock_agent_role._resolve_prompt_file("system", 2, mock_agent_role.name, writable_prompts_path)
+
+        assert resolve() == writable_prompts_path / "test_agent_system.jinja2"
+
+        phase_file = writable_prompts_path / "test_agent_system_phase_2.jinja2"
+        phase_file.write_text("Phase 2 system prompt")
+        assert resolve() == writable_prompts_path / "test_agent_system.jinja2"
+
+        AgentRole.clear_template_cache()
+        assert resolve() == phase_file
+
+    def test_resolve_prompt_file_missing_directory_not_cached(self, mock_agent_role, tmp_path):
+        """Test that a missing prompt directory is listed again once it exists."""
+        prompts_path = tmp_path / "missing_prompts"
+
+        def resolve():
+            return mock_agent_role._resolve_prompt_file("system", 2, mock_agent_role.name, prompts_path)
+
+        assert resolve() is None
+        assert prompts_path not in AgentRole._prompt_file_names
+
+        prompts_path.mkdir()
+        (prompts_path / "test_agent_system.jinja2").write_text("System prompt")
+        assert resolve() == prompts_path / "test_agent_system.jinja2"
+
+    def test_render_prompt_does_not_escape_values(self, mock_agent_role, writable_prompts_path):
+        """Test that markup and JSON in the context are rendered verbatim."""
+        (writable_prompts_path / "test_agent_user_phase_2.jinja2").write_text("Orders: {{ orders }}")
+        orders = '<bid price="5"> & {"ask": 7}'
+
+        result = mock_agent_role.render_prompt(
+            context={"orders": orders}, prompt_type="user", phase=2, prompts_path=writable_prompts_path
+        )
+
+        assert result == f"Orders: {orders}"
+
+    def test_template_bytecode_cache_dir(
+        self, mock_agent_role, game_state, writable_prompts_path, tmp_path, monkeypatch
+    ):
+        """Test that compiled templates are written to the bytecode cache directory when one is set."""
+        cache_dir = tmp_path / "jinja_cache"
+        monkeypatch.setattr(AgentRole, "template_bytecode_cache_dir", cache_dir)
+
+        result = mock_agent_role.render_prompt(
+            context=game_state.model_dump(), prompt_type="system", phase=0, prompts_path=writable_prompts_path
+        )
+
+        assert result == "System prompt for 0"
+        assert any(cache_dir.iterdir())
+
+    def test_template_environment_per_bytecode_cache_dir(self, mock_agent_role, prompts_path, tmp_path, monkeypatch):
+        """Test that roles sharing a prompt directory get separate environments for different bytecode caches."""
+        default_env = mock_agent_role._get_template_environment(prompts_path)
+        monkeypatch.setattr(type(mock_agent_role), "template_bytecode_cache_dir", tmp_path / "jinja_cache")
+
+        cached_env = mock_agent_role._get_template_environment(prompts_path)
+
+        assert cached_env is not default_env
+        assert isinstance(cached_env.bytecode_cache, FileSystemBytecodeCache)
+        assert default_env.bytecode_cache is None
+
+    def test_sandbox_templates(self, mock_agent_role, writable_prompts_path, monkeypatch):
+        """Test that roles can opt into rendering prompts in Jinja's sandbox."""
+        template = writable_prompts_path / "test_agent_user_phase_2.jinja2"
+        template.write_text("{{ orders.__class__.__init__.__globals__ }}")
+        monkeypatch.setattr(type(mock_agent_role), "sandbox_templates", True)
+
+        assert isinstance(mock_agent_role._get_template_environment(writable_prompts_path), SandboxedEnvironment)
+        with pytest.raises(SecurityError):
+            mock_agent_role.render_prompt(
+                context={"orders": []}, prompt_type="user", phase=2, prompts_path=writable_prompts_path
+            )
+
+    def test_prewarm_templates(self, mock_agent_role, writable_prompts_path):
+        """Test that prewarming compiles the agent's and the all-role templates."""
+        (writable_prompts_path / "other_agent_system.jinja2").write_text("Other agent prompt")
+
+        mock_agent_role.prewarm_templates(writable_prompts_path)
+
+        env = mock_agent_role._get_template_environment(writable_prompts_path)
+        cached_names = {name for _, name in env.cache.keys()}
+        assert {
+            "test_agent_system.jinja2",
+            "test_agent_user.jinja2",
+            "test_agent_system_phase_1.jinja2",
+            "test_agent_user_phase_1.jinja2",
+            "all_system.jinja2",
+        } <= cached_names
+        assert "other_agent_system.jinja2" not in cached_names
+
     def test_render_prompt_fallback_to_agent_general(self, mock_agent_role, game_state, monkeypatch, prompts_path):
         """Test fallback to agent-specific general prompt when phase-specific prompts don't exist."""
 
@@ -133,16 +303,12 @@ class TestPromptHandling:
         assert result == "Custom user prompt for phase 0"
 
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="class")
 class TestPhaseHandling:
     """Tests for phase handling."""
 
-    async def test_handle_phase_default(self, mock_agent_role, game_state, prompts_path, mocker):
+    async def test_handle_phase_default(self, mock_agent_role, game_state, prompts_path):
         """Test default phase handling with LLM."""
-        # Mock the LLM methods to track calls
-        mocker.spy(mock_agent_role.llm, "build_messages")
-        mocker.spy(mock_agent_role.llm, "get_response")
-
         result = await mock_agent_role.handle_phase(0, game_state, prompts_path)
 
         assert result == {"message": "test_response"}
@@ -178,15 +344,11 @@ class TestPhaseHandling:
 
         assert result is None
 
-    async def test_include_task_phase(self, mock_agent_role, phase1_game_state, prompts_path, mocker):
+    async def test_include_task_phase(self, mock_agent_role, phase1_game_state, prompts_path):
         """Test handling a phase that's in the task phases list."""
         # Modify task_phases for the test
         mock_agent_role.task_phases = [1, 2]
 
-        # Mock the LLM methods to track calls
-        mocker.spy(mock_agent_role.llm, "build_messages")
-        mocker.spy(mock_agent_role.llm, "get_response")
-
         result = await mock_agent_role.handle_phase(1, phase1_game_state, prompts_path)
 
         assert result == {"message": "test_response"}
@@ -199,10 +361,25 @@ class TestResponseParsing:
 
     def test_parse_phase_llm_response_default(self, mock_agent_role, game_state):
         """Test default response parsing."""
-        response = json.dumps({"message": "Hello"})
-        result = mock_agent_role.parse_phase_llm_response(response, game_state)
+        result = mock_agent_role.parse_phase_llm_response(_VALID_JSON, game_state)
         assert result == {"message": "Hello"}
 
+    def test_parse_phase_llm_response_code_fence(self, mock_agent_role, game_state):
+        """Test that a Markdown code fence around the JSON is ignored."""
+        fenced_json = f"```json\n{_VALID_JSON}\n```"
+        assert mock_agent_role.parse_phase_llm_response(fenced_json, game_state) == {"message": "Hello"}
+
+        fenced_plain = f"```\n{_VALID_JSON}\n```\n"
+        assert mock_agent_role.parse_phase_llm_response(fenced_plain, game_state) == {"message": "Hello"}
+
+    def test_parse_phase_llm_response_single_line_code_fence(self, mock_agent_role, game_state):
+        """Test that a code fence on the same line as the JSON is ignored."""
+        fenced_plain = f"```{_VALID_JSON}```"
+        assert mock_agent_role.parse_phase_llm_response(fenced_plain, game_state) == {"message": "Hello"}
+
+        fenced_json = f"```json {_VALID_JSON}```"
+        assert mock_agent_role.parse_phase_llm_response(fenced_json, game_state) == {"message": "Hello"}
+
     def test_parse_phase_llm_response_invalid_json(self, mock_agent_role, game_state):
         """Test handling invalid JSON responses."""
         response = "Not valid JSON"
@@ -210,6 +387,18 @@ class TestResponseParsing:
         assert "error" in result
         assert result["raw_response"] == "Not valid JSON"
 
+    def test_parse_phase_llm_response_skips_parsing_non_json(self, mock_agent_role, game_state, mocker):
+        """Test that responses that cannot start a JSON document are rejected without calling the JSON parser."""
+        loads = mocker.spy(json, "loads")
+
+        assert mock_agent_role.parse_phase_llm_response("Sure! Here you go.", game_state)["error"]
+        assert mock_agent_role.parse_phase_llm_response("", game_state)["error"]
+        assert loads.call_count == 0
+
+        assert mock_agent_role.parse_phase_llm_response('{"message": ', game_state)["error"]
+        assert mock_agent_role.parse_phase_llm_response(f"  {_VALID_JSON}", game_state) == {"message": "Hello"}
+        assert loads.call_count == 2
+
     def test_custom_response_parser(self, mock_agent_role, game_state):
         """Test registering and using a custom response parser."""
 
@@ -251,6 +440,49 @@ class TestPhaseSpecificMethods:
         assert 1 in agent._response_parsers
         assert 1 in agent._phase_handlers
 
+    def test_auto_register_inherited_methods(self, logger):
+        """Test that phase-specific methods are found once per class and include inherited ones."""
+
+        class BaseAgent(AgentRole[GameStateProtocol]):
+            role: ClassVar[int] = 1
+            name: ClassVar[str] = "base_agent"
+            llm = MockLLM()
+
+            def get_phase_1_system_prompt(self, state):
+                return "Base system prompt"
+
+        class DerivedAgent(BaseAgent):
+            def get_phase_1_system_prompt(self, state):
+                return "Derived system prompt"
+
+            def get_phase_2_user_prompt(self, state):
+                return "Derived user prompt"
+
+        assert DerivedAgent._phase_methods == (
+            ("system_prompt", 1, "get_phase_1_system_prompt"),
+            ("user_prompt", 2, "get_phase_2_user_prompt"),
+        )
+
+        agent = DerivedAgent(logger=logger)
+        assert agent._system_prompt_handlers[1](None) == "Derived system prompt"
+        assert agent._user_prompt_handlers[2](None) == "Derived user prompt"
+        assert BaseAgent(logger=logger)._user_prompt_handlers == {}
+
+    def test_auto_register_mixin_methods(self, logger):
+        """Test that phase-specific methods from mixins that are not roles are registered."""
+
+        class UserPromptMixin:
+            def get_phase_3_user_prompt(self, state):
+                return "Mixin user prompt"
+
+        class MixedAgent(UserPromptMixin, AgentRole[GameStateProtocol]):
+            role: ClassVar[int] = 1
+            name: ClassVar[str] = "mixed_agent"
+            llm = MockLLM()
+
+        assert MixedAgent._phase_methods == (("user_prompt", 3, "get_phase_3_user_prompt"),)
+        assert MixedAgent(logger=logger)._user_prompt_handlers[3](None) == "Mixin user prompt"
+
     @pytest.mark.asyncio
     async def test_llm_error_handling(self, mock_agent_role, game_state, mocker, prompts_path):
         """Test error handling when LLM raises an exception."""
@@ -266,3 +498,41 @@ class TestPhaseSpecificMethods:
         assert "error" in result
         assert result["phase"] == 0
         assert "LLM error" in result["error"]
+
+    @pytest.mark.asyncio
+    async def test_llm_response_cache(self, mock_agent_role, game_state, phase1_game_state, mocker, prompts_path):
+        """Test that identical prompts reuse the cached LLM response when the cache is enabled."""
+        mocker.patch.object(type(mock_agent_role), "llm_response_cache_size", 1)
+        get_response = mock_agent_role.llm.get_response
+
+        first = await mock_agent_role.handle_phase_with_llm(0, game_state, prompts_path)
+        second = await mock_agent_role.handle_phase_with_llm(0, game_state, prompts_path)
+        assert first == second == {"message": "test_response"}
+        assert first is not second
+        assert get_response.call_count == 1
+
+        # A different prompt evicts the only cached response
+        await mock_agent_role.handle_phase_with_llm(1, phase1_game_state, prompts_path)
+        await mock_agent_role.handle_phase_with_llm(0, game_state, prompts_path)
+        assert get_response.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_handle_phase_with_llm_dumps_state_once(self, mock_agent_role, game_state, mocker, prompts_path):
+        """Test that both prompts and the trace share a single dump of the state."""
+        model_dump = mocker.spy(type(game_state), "model_dump")
+        get_response = mock_agent_role.llm.get_response
+
+        await mock_agent_role.handle_phase_with_llm(0, game_state, prompts_path)
+
+        assert model_dump.call_count == 1
+        assert get_response.call_args.kwargs["tracing_extra"]["state"] == game_state.model_dump()
+
+    @pytest.mark.asyncio
+    async def test_llm_response_cache_disabled_by_default(self, mock_agent_role, game_state, prompts_path):
+        """Test that every phase calls the LLM when the cache is disabled."""
+        get_response = mock_agent_role.llm.get_response
+
+        await mock_agent_role.handle_phase_with_llm(0, game_state, prompts_path)
+        await mock_agent_role.handle_phase_with_llm(0, game_state, prompts_path)
+
+        assert get_response.call_count == 2
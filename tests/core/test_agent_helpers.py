@@ -45,6 +45,27 @@ class TestHelperMethods:
             is None
         )
 
+    def test_phase_method_pattern(self, mock_agent_role):
+        """Test that the combined pattern names the kind and phase of each phase-specific method."""
+        pattern = mock_agent_role._PHASE_METHOD_PATTERN
+        for name, kind, phase in (
+            ("get_phase_1_system_prompt", "system_prompt", "1"),
+            ("get_phase_42_user_prompt", "user_prompt", "42"),
+            ("parse_phase_7_llm_response", "response_parser", "7"),
+            ("handle_phase_15", "phase_handler", "15"),
+        ):
+            match = pattern.match(name)
+            assert match is not None
+            assert (match.lastgroup, match[match.lastgroup]) == (kind, phase)
+
+        for name in (
+            "invalid_method_name",
+            "get_phase_x_system_prompt",
+            "handle_phase_1_extra",
+            "handle_phase_with_llm",
+        ):
+            assert pattern.match(name) is None
+
     def test_resolve_prompt_file(self, mock_agent_role, prompts_path):
         """Test resolving prompt file paths."""
         # Phase-specific prompt should be found
@@ -1,7 +1,7 @@
 import json
 import pytest
 from typing import Any, Dict
-from pydantic import Field
+from pydantic import Field, ValidationError
 
 from econagents.core.events import Message
 from econagents.core.state.fields import EventField
@@ -44,6 +44,13 @@ class TestPropertyMapping:
 
         assert "Cannot specify both events and exclude_events" in str(exc_info.value)
 
+    def test_is_immutable(self):
+        """Test that mappings cannot be changed after they are built."""
+        mapping = PropertyMapping(event_key="test_event_key", state_key="test_state_key")
+
+        with pytest.raises(ValidationError):
+            mapping.state_key = "other_state_key"
+
     def test_should_apply_in_event_no_restrictions(self):
         """Test should_apply_in_event with no restrictions."""
         mapping = PropertyMapping(
@@ -167,6 +174,29 @@ class TestGameState:
         assert state.custom_handler_called is True
         assert state.meta.game_id == 789
 
+    def test_copy_rebinds_custom_handlers(self):
+        """Test that a copied state's custom handlers update the copy, not the original."""
+        state = CustomGameState()
+        event = Message(message_type="test", event_type="custom_event", data={"game_id": 789})
+
+        copied = state.model_copy()
+        copied.update(event)
+
+        assert copied.custom_handler_called is True
+        assert state.custom_handler_called is False
+
+    def test_deep_copy_rebinds_custom_handlers(self):
+        """Test that a deep-copied state's custom handlers update the copy, not the original."""
+        state = CustomGameState()
+        event = Message(message_type="test", event_type="custom_event", data={"game_id": 789})
+
+        copied = state.model_copy(deep=True)
+        copied.update(event)
+
+        assert copied.meta.game_id == 789
+        assert state.meta.game_id == 0
+        assert state.custom_handler_called is False
+
     def test_update_with_missing_event_key(self):
         """Test update behavior when event key is missing from data."""
         state = GameState()
@@ -0,0 +1,137 @@
+import logging
+
+import pytest
+
+from econagents.core.game_runner import CachedTimeFormatter, GameRunner, GameRunnerConfig, ctx_agent_id
+
+
+@pytest.fixture
+def game_runner(tmp_path):
+    """Provide a game runner that writes its logs to a temporary directory."""
+    config = GameRunnerConfig(hostname="localhost", path="wss", port=8765, game_id=1, logs_dir=tmp_path / "logs")
+    runner = GameRunner(config=config, agents=[])
+    yield runner
+    runner.cleanup_logging()
+
+
+class TestLogging:
+    """Tests for the game and agent loggers."""
+
+    def test_agent_logger_writes_through_background_listeners(self, game_runner):
+        """Test that agent records reach the agent and game log files once the listeners are drained."""
+        agent_logger = game_runner.get_agent_logger(agent_id=2, game_id=1)
+        token = ctx_agent_id.set("2")
+        try:
+            agent_logger.info("hello from agent")
+        finally:
+            ctx_agent_id.reset(token)
+
+        game_runner.cleanup_logging()
+
+        game_dir = game_runner.config.logs_dir / "game_1"
+        assert "[AGENT 2] hello from agent" in (game_dir / "agent_2.log").read_text()
+        assert "[AGENT 2] hello from agent" in (game_dir / "all.log").read_text()
+
+    def test_agent_logger_clears_previous_agent_log(self, game_runner):
+        """Test that an agent's log file starts empty each time its logger is set up."""
+        agent_log_file = game_runner.config.logs_dir / "game_1" / "agent_3.log"
+        agent_log_file.parent.mkdir(parents=True)
+        agent_log_file.write_text("previous run\n")
+
+        game_runner.get_agent_logger(agent_id=3, game_id=1)
+
+        assert agent_log_file.read_text() == ""
+
+    def test_game_logger_writes_to_game_log(self, game_runner):
+        """Test that game records are written to the game log outside of any agent context."""
+        game_runner.get_game_logger(game_id=1).info("game started")
+
+        game_runner.cleanup_logging()
+
+        game_log = (game_runner.config.logs_dir / "game_1" / "all.log").read_text()
+        assert "[AGENT N/A] game started" in game_log
+
+    def test_loggers_share_one_listener(self, game_runner):
+        """Test that all agent and game loggers feed a single queue and background listener."""
+        loggers = [game_runner.get_game_logger(game_id=1)]
+        loggers += [game_runner.get_agent_logger(agent_id=agent_id, game_id=1) for agent_id in (1, 2, 3)]
+        listener = game_runner.log_listener
+
+        assert listener is not None
+        assert all(
+            [handler.queue for handler in logger.handlers] == [game_runner.log_queue] for logger in loggers
+        )
+
+        game_runner.get_agent_logger(agent_id=4, game_id=1)
+        assert game_runner.log_listener is listener
+
+    def test_cleanup_logging_stops_listener_and_detaches_loggers(self, game_runner):
+        """Test that cleanup stops the listener and leaves no logger writing into the stopped queue."""
+        game_logger = game_runner.get_game_logger(game_id=1)
+        agent_logger = game_runner.get_agent_logger(agent_id=1, game_id=1)
+        listener = game_runner.log_listener
+
+        game_runner.cleanup_logging()
+
+        assert listener._thread is None
+        assert game_runner.log_listener is None
+        for logger in (game_logger, agent_logger):
+            assert logger.handlers == []
+            assert logger.propagate is True
+        agent_logger.warning("after cleanup")
+        assert game_runner.log_queue.empty()
+
+    def test_reconfiguring_agent_logger_closes_previous_handlers(self, game_runner):
+        """Test that setting up an agent logger again closes its previous handlers but not the shared game log."""
+        game_runner.get_agent_logger(agent_id=1, game_id=1)
+        file_handler, console_handler, game_handler = game_runner.log_router.routes["agent_1"]
+
+        game_runner.get_agent_logger(agent_id=1, game_id=1)
+
+        assert file_handler.stream is None
+        assert game_runner.log_router.routes["agent_1"][2] is game_handler
+        assert game_handler.stream is not None
+
+    def test_agent_logger_reconfigured_without_duplicate_handlers(self, game_runner):
+        """Test that getting an agent logger again doesn't duplicate its handlers or context filter."""
+        first = game_runner.get_agent_logger(agent_id=1, game_id=1)
+        handler_count = len(first.handlers)
+
+        second = game_runner.get_agent_logger(agent_id=1, game_id=1)
+
+        assert second is first
+        assert len(second.handlers) == handler_count
+        assert second.propagate is False
+        assert len(second.filters) == 1
+        assert not any(handler.filters for handler in second.handlers)
+
+    def test_propagate_logs(self, tmp_path, caplog):
+        """Test that records only reach the root logger's handlers when propagate_logs is set."""
+        config = GameRunnerConfig(
+            hostname="localhost", path="wss", port=8765, game_id=1, logs_dir=tmp_path / "logs", propagate_logs=True
+        )
+        runner = GameRunner(config=config, agents=[])
+        try:
+            runner.get_game_logger(game_id=1).info("visible to caplog")
+        finally:
+            runner.cleanup_logging()
+
+        assert "visible to caplog" in caplog.messages
+
+    def test_loggers_do_not_propagate_by_default(self, game_runner):
+        """Test that agent and game records are not passed on to the root logger by default."""
+        assert game_runner.get_game_logger(game_id=1).propagate is False
+        assert game_runner.get_agent_logger(agent_id=1, game_id=1).propagate is False
+
+
+class TestCachedTimeFormatter:
+    """Tests for the formatter that reuses the formatted time within a second."""
+
+    def test_matches_standard_formatter(self):
+        """Test that records within and across seconds get the same timestamps as logging.Formatter."""
+        fmt = "%(asctime)s %(message)s"
+        formatter = CachedTimeFormatter(fmt)
+        for created in (1700000000.123, 1700000000.987, 1700000001.5):
+            record = logging.makeLogRecord({"msg": "hello", "created": created, "msecs": (created % 1) * 1000})
+
+            assert formatter.format(record) == logging.Formatter(fmt).format(record)
@@ -1,6 +1,5 @@
 import asyncio
 import json
-import logging
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -13,12 +12,6 @@ class SimpleTestMessage(Message):
     """Simple message class for testing purposes."""
 
 
-@pytest.fixture
-def logger():
-    """Provide a logger for tests."""
-    return logging.getLogger("test_manager")
-
-
 @pytest.fixture
 def agent_manager(logger):
     """Create a basic agent manager for testing."""
@@ -52,6 +45,16 @@ class TestMessageHandling:
         message = agent_manager._extract_message_data(invalid_json)
         assert message is None
 
+        # Valid JSON that is not an object (e.g. a bare keepalive value)
+        assert agent_manager._extract_message_data("1") is None
+        assert agent_manager._extract_message_data('["ping"]') is None
+
+        # Fields of the wrong type are rejected here instead of failing later in the state's event handlers
+        assert agent_manager._extract_message_data(json.dumps({"type": "event", "data": ["key"]})) is None
+        assert agent_manager._extract_message_data(json.dumps({"type": "event", "data": "key"})) is None
+        assert agent_manager._extract_message_data(json.dumps({"type": 1, "eventType": "test-event"})) is None
+        assert agent_manager._extract_message_data(json.dumps({"type": "event", "eventType": None})) is None
+
     @pytest.mark.asyncio
     async def test_send_message(self, agent_manager):
         """Test that send_message correctly sends data through the transport."""
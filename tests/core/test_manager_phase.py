@@ -1,21 +1,14 @@
 import asyncio
 import json
-import logging
 import pytest
-import random
 from unittest.mock import AsyncMock, MagicMock, patch
 
 from econagents.core.agent_role import AgentRole
 from econagents.core.events import Message
 from econagents.core.manager.phase import PhaseManager, TurnBasedPhaseManager, HybridPhaseManager
-from econagents.core.state.game import GameState
 from econagents.core.transport import WebSocketTransport, SimpleLoginPayloadAuth
 
 
-class SimpleGameState(GameState):
-    """Simple game state for testing."""
-
-
 class SimplePhaseManager(PhaseManager):
     """Concrete implementation of PhaseManager for testing."""
 
@@ -24,26 +17,12 @@ class SimplePhaseManager(PhaseManager):
         return {"action": f"phase-{phase}-action"}
 
 
-@pytest.fixture
-def logger():
-    """Provide a logger for tests."""
-    return logging.getLogger("test_phase_manager")
-
-
-@pytest.fixture
-def game_state():
-    """Provide a simple game state for testing."""
-    state = SimpleGameState()
-    state.meta.phase = 0
-    state.meta.game_id = 123
-    return state
-
-
 @pytest.fixture
 def mock_agent():
     """Provide a mock agent for testing."""
     agent = MagicMock(spec=AgentRole)
     agent.handle_phase = AsyncMock(return_value={"message": "agent_response"})
+    agent.participates_in_phase.return_value = True
     agent.name = "MockAgent"
     return agent
 
@@ -70,8 +49,8 @@ def phase_manager(logger, game_state, mock_agent):
         manager.transport.start_listening = AsyncMock()
         manager.transport.stop = AsyncMock()
 
-        # Patch random.randint to return a predictable value for testing
-        with patch.object(random, "randint", return_value=1):
+        # Patch the manager's RNG to return a predictable value for testing
+        with patch.object(manager._rng, "randint", return_value=1):
             yield manager
 
 
@@ -109,8 +88,8 @@ def hybrid_phase_manager(logger, game_state, mock_agent):
         manager.transport.start_listening = AsyncMock()
         manager.transport.stop = AsyncMock()
 
-        # Patch random.randint to return a predictable value for testing
-        with patch.object(random, "randint", return_value=1):
+        # Patch the manager's RNG to return a predictable value for testing
+        with patch.object(manager._rng, "randint", return_value=1):
             yield manager
 
 
@@ -319,6 +298,17 @@ class TestDiscretePhaseManager:
         expected_payload = json.dumps({"custom": True})
         discrete_phase_manager.transport.send.assert_called_once_with(expected_payload)
 
+    @pytest.mark.asyncio
+    async def test_execute_phase_action_skips_phases_agent_ignores(self, discrete_phase_manager, mock_agent):
+        """Test that the agent is not asked to handle phases it does not act in."""
+        mock_agent.participates_in_phase.return_value = False
+
+        await discrete_phase_manager.execute_phase_action(1)
+
+        mock_agent.participates_in_phase.assert_called_once_with(1)
+        mock_agent.handle_phase.assert_not_called()
+        discrete_phase_manager.transport.send.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_execute_phase_action_no_agent(self, discrete_phase_manager):
         """Test execute_phase_action without an agent."""
@@ -402,6 +392,16 @@ class TestHybridPhaseManager:
 class TestPhaseLifecycleHooks:
     """Tests for phase lifecycle hooks."""
 
+    async def test_prompts_prewarmed_on_start_only(self, phase_manager, mock_agent, tmp_path):
+        """Test that prompt templates are compiled when the manager starts, not when the agent role is set."""
+        phase_manager.prompts_dir = tmp_path
+        phase_manager.agent_role = mock_agent
+        mock_agent.prewarm_templates.assert_not_called()
+
+        await phase_manager.start()
+
+        mock_agent.prewarm_templates.assert_called_once_with(tmp_path)
+
     async def test_on_phase_start(self, phase_manager, monkeypatch):
         """Test the on_phase_start hook."""
         # Create a mock for on_phase_start
@@ -0,0 +1,151 @@
+import pytest
+
+from econagents.core.state.market import MarketState, Order
+
+
+def order_data(order_id: int, price: float, order_type: str, sender: int = 1) -> dict:
+    """Build the order payload sent by the server."""
+    return {"id": order_id, "sender": sender, "price": price, "quantity": 1, "type": order_type, "condition": 0}
+
+
+@pytest.fixture
+def market_state():
+    """Provide a market with a few asks and bids."""
+    market = MarketState()
+    for order_id, price, order_type in [(1, 10, "ask"), (2, 12, "bid"), (3, 15, "ask"), (4, 8, "bid"), (5, 10, "ask")]:
+        market.process_event("add-order", {"order": order_data(order_id, price, order_type)})
+    return market
+
+
+class TestOrderBook:
+    """Tests for the incrementally sorted order book."""
+
+    def test_add_order_keeps_sides_sorted(self, market_state):
+        """Test that asks and bids are kept sorted by ascending price, newest first on ties."""
+        assert [order.id for order in market_state.sorted_asks] == [5, 1, 3]
+        assert [order.id for order in market_state.sorted_bids] == [4, 2]
+
+    def test_delete_order_removes_from_book(self, market_state):
+        """Test that deleted orders are removed from their side of the book."""
+        market_state.process_event("delete-order", {"order": {"id": 1}})
+        market_state.process_event("delete-order", {"order": {"id": 4}})
+
+        assert [order.id for order in market_state.sorted_asks] == [5, 3]
+        assert [order.id for order in market_state.sorted_bids] == [2]
+        assert 1 not in market_state.orders
+
+    def test_update_order_is_reflected_in_book(self, market_state):
+        """Test that quantity updates are visible through the sorted book."""
+        market_state.process_event("update-order", {"order": {"id": 2, "quantity": 3}})
+
+        assert market_state.sorted_bids[-1].quantity == 3
+
+    def test_order_book_matches_full_sort(self, market_state):
+        """Test that order_book renders asks then bids in the same order as a full sort."""
+        orders = list(market_state.orders.values())
+        expected = sorted([o for o in orders if o.type == "ask"], key=lambda o: o.price, reverse=True) + sorted(
+            [o for o in orders if o.type == "bid"], key=lambda o: o.price, reverse=True
+        )
+
+        assert market_state.order_book == "\n".join(str(order) for order in expected)
+
+    def test_order_book_depth_limits_each_side(self, market_state, monkeypatch):
+        """Test that order_book_depth keeps only the orders closest to the spread."""
+        monkeypatch.setattr(MarketState, "order_book_depth", 1)
+        asks, bids = market_state.sorted_asks, market_state.sorted_bids
+
+        assert market_state.order_book == "\n".join(str(order) for order in [asks[0], bids[-1]])
+
+        monkeypatch.setattr(MarketState, "order_book_depth", 10)
+        assert market_state.order_book == "\n".join(str(order) for order in asks[::-1] + bids[::-1])
+
+    def test_book_built_from_initial_orders(self):
+        """Test that orders passed at construction are indexed."""
+        market = MarketState(
+            orders={
+                1: Order(**order_data(1, 5, "bid")),
+                2: Order(**order_data(2, 9, "bid")),
+                3: Order(**order_data(3, 7, "ask")),
+            }
+        )
+
+        assert [order.id for order in market.sorted_bids] == [1, 2]
+        assert [order.id for order in market.sorted_asks] == [3]
+
+    def test_contract_fulfilled_records_trade(self, market_state):
+        """Test that fulfilled contracts are recorded as trades."""
+        market_state.process_event("contract-fulfilled", {"from": 1, "to": 2, "price": 11, "condition": 0})
+
+        assert len(market_state.trades) == 1
+        assert market_state.trades[0].price == 11
+
+    def test_unknown_event_is_ignored(self, market_state):
+        """Test that events without a market handler leave the market unchanged."""
+        order_book = market_state.order_book
+
+        market_state.process_event("asset-movement", {"balance": 10, "shares": 1})
+
+        assert market_state.order_book == order_book
+        assert not market_state.trades
+
+    def test_get_orders_from_player(self, market_state):
+        """Test that a player's orders follow adds, replacements and deletes."""
+        market_state.process_event("add-order", {"order": order_data(6, 9, "bid", sender=2)})
+        market_state.process_event("add-order", {"order": order_data(7, 14, "ask", sender=2)})
+
+        assert [order.id for order in market_state.get_orders_from_player(2)] == [6, 7]
+
+        market_state.process_event("delete-order", {"order": {"id": 6}})
+        market_state.process_event("add-order", {"order": order_data(7, 13, "ask", sender=3)})
+
+        assert market_state.get_orders_from_player(2) == []
+        assert market_state.get_orders_from_player(3) == [market_state.orders[7]]
+        assert [order.id for order in market_state.get_orders_from_player(1)] == [1, 2, 3, 4, 5]
+
+    def test_best_ask_and_bid(self, market_state):
+        """Test that the best orders are the best-priced ones, oldest first on ties."""
+        assert market_state.best_ask.id == 1
+        assert market_state.best_bid.id == 2
+
+        market_state.process_event("delete-order", {"order": {"id": 1}})
+        market_state.process_event("delete-order", {"order": {"id": 2}})
+
+        assert market_state.best_ask.id == 5
+        assert market_state.best_bid.id == 4
+
+    def test_best_ask_and_bid_empty_book(self):
+        """Test that an empty book has no best orders."""
+        market = MarketState()
+
+        assert market.best_ask is None
+        assert market.best_bid is None
+
+    def test_assigning_orders_rebuilds_book(self, market_state):
+        """Test that replacing the orders dict rebuilds the sorted book."""
+        market_state.orders = {9: market_state.orders[3]}
+
+        assert [order.id for order in market_state.sorted_asks] == [3]
+        assert market_state.sorted_bids == []
+        assert [order.id for order in market_state.get_orders_from_player(1)] == [3]
+
+    def test_copy_has_independent_book(self, market_state):
+        """Test that a copied market keeps its own book in sync with its own orders."""
+        copied = market_state.model_copy()
+
+        copied.process_event("delete-order", {"order": {"id": 1}})
+
+        assert copied.best_ask.id == 5
+        assert 1 not in copied.orders
+        assert market_state.best_ask.id == 1
+        assert 1 in market_state.orders
+        assert [order.id for order in market_state.sorted_asks] == [5, 1, 3]
+
+    def test_deep_copy_has_independent_book(self, market_state):
+        """Test that a deep-copied market keeps its own book in sync with its own orders."""
+        copied = market_state.model_copy(deep=True)
+
+        copied.process_event("add-order", {"order": order_data(6, 9, "ask")})
+
+        assert copied.best_ask.id == 6
+        assert market_state.best_ask.id == 1
+        assert 6 not in market_state.orders
@@ -1,5 +1,4 @@
 import json
-import logging
 import pytest
 import pytest_asyncio
 import asyncio
@@ -102,12 +101,6 @@ async def ws_server():
     await server.stop()
 
 
-@pytest.fixture
-def logger():
-    """Provide a logger for tests."""
-    return logging.getLogger("test_logger")
-
-
 @pytest.fixture
 def login_payload():
     """Provide a sample login payload."""
@@ -255,6 +248,23 @@ class TestWebSocketTransport:
 
         assert test_message_found, "Test message not found in received messages"
 
+    @pytest.mark.asyncio
+    async def test_send_messages_preserve_order(self, transport, ws_server):
+        """Test that back-to-back sends are delivered in order and flushed on stop."""
+        transport.url = ws_server.url
+        await transport.connect()
+        await asyncio.sleep(0.2)
+        ws_server.received_messages = []
+
+        payloads = [json.dumps({"type": "test", "seq": i}) for i in range(10)]
+        for payload in payloads:
+            await transport.send(payload)
+
+        await transport.stop()
+        await asyncio.sleep(0.2)
+
+        assert ws_server.received_messages == payloads
+
     @pytest.mark.asyncio
     async def test_send_message_no_connection(self, transport):
         """Test sending a message when no WebSocket connection exists."""
@@ -335,6 +345,7 @@ class TestWebSocketTransport:
 
         # Wait for a moment to ensure listening has started
         await asyncio.sleep(0.2)
+        await transport.send(json.dumps({"type": "test"}))
 
         # Close the server
         await ws_server.stop()
@@ -352,6 +363,8 @@ class TestWebSocketTransport:
 
         # Verify running state is False after connection closed
         assert transport._running is False
+        # The writer task doesn't outlive the connection
+        assert transport._writer_task is None
 
     @pytest.mark.asyncio
     async def test_stop(self, transport, ws_server):
@@ -370,6 +383,28 @@ class TestWebSocketTransport:
         assert transport._running is False
         # WebSocket should be closed (ws attribute might still exist but the connection is closed)
 
+    @pytest.mark.asyncio
+    async def test_stop_drops_messages_on_stalled_socket(self, transport, mocker):
+        """Test that stop gives up flushing after flush_timeout and logs the messages it drops."""
+
+        class StalledConnection:
+            async def send(self, message):
+                await asyncio.Event().wait()
+
+            async def close(self):
+                pass
+
+        transport.ws = StalledConnection()
+        transport.flush_timeout = 0.1
+        log_error = mocker.spy(transport.logger, "error")
+
+        await transport.send("first")
+        await transport.send("second")
+        await asyncio.wait_for(transport.stop(), timeout=2.0)
+
+        assert transport._writer_task is None
+        assert any("Dropped 1 unsent message(s)" in call.args[0] for call in log_error.call_args_list)
+
     @pytest.mark.asyncio
     async def test_auth_mechanism_called(self, transport, ws_server, login_payload):
         """Test that the auth_mechanism's authenticate method is called with the correct parameters."""